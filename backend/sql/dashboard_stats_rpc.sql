@@ -0,0 +1,41 @@
+-- RPC returning the dashboard counters in one round-trip.
+-- Expected params:
+--   uid uuid (NULL aggregates across all users, used by the dev dashboard)
+
+-- The result columns changed (analyses added), so drop before recreating
+DROP FUNCTION IF EXISTS public.dashboard_stats(uuid);
+
+CREATE OR REPLACE FUNCTION public.dashboard_stats(uid uuid DEFAULT NULL)
+RETURNS TABLE (
+	uploaded bigint,
+	processed bigint,
+	analyses bigint,
+	comparisons bigint
+)
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+	WITH policy_counts AS (
+		SELECT
+			count(*) AS uploaded,
+			count(*) FILTER (
+				WHERE p.extracted_text IS NOT NULL AND length(btrim(p.extracted_text)) > 0
+			) AS processed,
+			count(*) FILTER (
+				WHERE p.validation_metadata ? 'analysis_result'
+			) AS analyses
+		FROM public.policies p
+		WHERE uid IS NULL OR p.user_id = uid
+	),
+	comparison_counts AS (
+		SELECT count(*) AS comparisons
+		FROM public.comparisons c
+		WHERE uid IS NULL OR c.user_id = uid
+	)
+	SELECT pc.uploaded, pc.processed, pc.analyses, cc.comparisons
+	FROM policy_counts pc, comparison_counts cc;
+$$;
+
+REVOKE ALL ON FUNCTION public.dashboard_stats(uuid) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.dashboard_stats(uuid) TO anon, authenticated, service_role;
@@ -0,0 +1,10 @@
+-- Policy File Hash Migration
+-- Store a SHA-256 of each uploaded file so re-uploads can reuse the existing policy
+-- instead of re-running extraction and storage upload
+
+ALTER TABLE public.policies
+ADD COLUMN IF NOT EXISTS file_hash TEXT;
+
+COMMENT ON COLUMN public.policies.file_hash IS 'SHA-256 hex digest of the uploaded file bytes (NULL for text uploads)';
+
+CREATE INDEX IF NOT EXISTS idx_policies_user_id_file_hash ON public.policies(user_id, file_hash);
@@ -0,0 +1,13 @@
+-- Processed Policies Partial Index (online build)
+-- Covers lookups of a user's policies that have extracted text, e.g. /chat-multiple
+-- filtering on extracted_text IS NOT NULL AND extracted_text <> ''.
+-- The (user_id, created_at DESC) index backing /activities ordering already lives in
+-- user_created_at_indexes.sql. Run outside a transaction block (CONCURRENTLY).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_policies_user_id_processed
+ON public.policies(user_id)
+WHERE extracted_text IS NOT NULL AND extracted_text <> '';
+
+-- Verify: the plan should use idx_policies_user_id_processed.
+-- EXPLAIN ANALYZE SELECT count(*) FROM public.policies
+--   WHERE user_id = '<uuid>' AND extracted_text IS NOT NULL AND extracted_text <> '';
@@ -0,0 +1,12 @@
+-- Policy Test Data Flag Migration
+-- Flag automated-test fixtures once at upload instead of scanning extracted_text on every read
+
+ALTER TABLE public.policies
+ADD COLUMN IF NOT EXISTS is_test_data BOOLEAN NOT NULL DEFAULT false;
+
+COMMENT ON COLUMN public.policies.is_test_data IS 'True when extracted_text contains the automated-testing sentinel';
+
+-- Backfill existing rows
+UPDATE public.policies
+SET is_test_data = true
+WHERE extracted_text ILIKE '%test insurance policy for automated testing%';
@@ -0,0 +1,7 @@
+-- Policy Text Length Migration
+-- Persist the extracted text length so read-only paths don't ship the full text just to measure it
+
+ALTER TABLE public.policies
+ADD COLUMN IF NOT EXISTS text_length INT GENERATED ALWAYS AS (char_length(extracted_text)) STORED;
+
+COMMENT ON COLUMN public.policies.text_length IS 'Character length of extracted_text, maintained by Postgres';
@@ -0,0 +1,17 @@
+-- User Timeline Indexes (online build)
+-- Every read path filters by user_id and orders by created_at DESC.
+-- Same indexes as add_performance_indexes.sql, built CONCURRENTLY so they can be
+-- applied to a live database without blocking writes. Run each statement on its
+-- own (CONCURRENTLY cannot run inside a transaction block).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_policies_user_id_created_at ON public.policies(user_id, created_at DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chat_logs_user_id_timestamp ON public.chat_logs(user_id, "timestamp" DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_comparisons_user_id_created_at ON public.comparisons(user_id, created_at DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_activities_user_id_created_at ON public.activities(user_id, created_at DESC);
+
+-- Verify: the plan should show an Index Scan (or Bitmap Index Scan) on the
+-- composite index with no Sort node above it.
+-- EXPLAIN ANALYZE SELECT * FROM public.activities
+--   WHERE user_id = '<uuid>' ORDER BY created_at DESC LIMIT 50;
+-- EXPLAIN ANALYZE SELECT id, policy_name, created_at FROM public.policies
+--   WHERE user_id = '<uuid>' ORDER BY created_at DESC LIMIT 20;
@@ -0,0 +1,154 @@
+-- User Dashboard Stats Table
+-- One row per user with the /dashboard/stats counters, kept current by triggers on
+-- policies and comparisons so the endpoint is a single primary-key lookup.
+-- Counters are maintained incrementally rather than by refreshing a materialized view.
+
+CREATE TABLE IF NOT EXISTS public.user_dashboard_stats (
+  user_id UUID PRIMARY KEY,
+  uploaded BIGINT NOT NULL DEFAULT 0,
+  processed BIGINT NOT NULL DEFAULT 0,
+  analyses BIGINT NOT NULL DEFAULT 0,
+  comparisons BIGINT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+);
+
+ALTER TABLE public.user_dashboard_stats
+ADD COLUMN IF NOT EXISTS analyses BIGINT NOT NULL DEFAULT 0;
+
+COMMENT ON TABLE public.user_dashboard_stats IS 'Per-user dashboard counters, maintained by triggers on policies and comparisons';
+COMMENT ON COLUMN public.user_dashboard_stats.uploaded IS 'Number of policies owned by the user';
+COMMENT ON COLUMN public.user_dashboard_stats.processed IS 'Policies with non-blank extracted_text';
+COMMENT ON COLUMN public.user_dashboard_stats.analyses IS 'Policies whose validation_metadata holds an analysis_result';
+COMMENT ON COLUMN public.user_dashboard_stats.comparisons IS 'Number of comparisons run by the user (trg_comparisons_dashboard_stats)';
+
+-- Owners may read their own counters; only the SECURITY DEFINER triggers write
+ALTER TABLE public.user_dashboard_stats ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view their dashboard stats" ON public.user_dashboard_stats;
+CREATE POLICY "Users can view their dashboard stats" ON public.user_dashboard_stats
+  FOR SELECT USING (auth.uid() = user_id);
+
+REVOKE INSERT, UPDATE, DELETE, TRUNCATE ON public.user_dashboard_stats FROM anon, authenticated;
+GRANT SELECT ON public.user_dashboard_stats TO authenticated;
+
+DROP FUNCTION IF EXISTS public.bump_user_dashboard_stats(uuid, int, int, int);
+
+CREATE OR REPLACE FUNCTION public.bump_user_dashboard_stats(
+	uid uuid,
+	d_uploaded int,
+	d_processed int,
+	d_analyses int,
+	d_comparisons int
+)
+RETURNS void
+LANGUAGE sql
+AS $$
+	INSERT INTO public.user_dashboard_stats AS s (user_id, uploaded, processed, analyses, comparisons)
+	VALUES (
+		uid,
+		greatest(d_uploaded, 0),
+		greatest(d_processed, 0),
+		greatest(d_analyses, 0),
+		greatest(d_comparisons, 0)
+	)
+	ON CONFLICT (user_id) DO UPDATE SET
+		uploaded = greatest(s.uploaded + d_uploaded, 0),
+		processed = greatest(s.processed + d_processed, 0),
+		analyses = greatest(s.analyses + d_analyses, 0),
+		comparisons = greatest(s.comparisons + d_comparisons, 0),
+		updated_at = now();
+$$;
+
+CREATE OR REPLACE FUNCTION public.policies_dashboard_stats_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+	IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.user_id IS NOT NULL THEN
+		PERFORM public.bump_user_dashboard_stats(
+			OLD.user_id,
+			-1,
+			-(CASE WHEN length(btrim(coalesce(OLD.extracted_text, ''))) > 0 THEN 1 ELSE 0 END),
+			-(CASE WHEN OLD.validation_metadata ? 'analysis_result' THEN 1 ELSE 0 END),
+			0
+		);
+	END IF;
+	IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.user_id IS NOT NULL THEN
+		PERFORM public.bump_user_dashboard_stats(
+			NEW.user_id,
+			1,
+			CASE WHEN length(btrim(coalesce(NEW.extracted_text, ''))) > 0 THEN 1 ELSE 0 END,
+			CASE WHEN NEW.validation_metadata ? 'analysis_result' THEN 1 ELSE 0 END,
+			0
+		);
+	END IF;
+	RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.comparisons_dashboard_stats_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+	IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.user_id IS NOT NULL THEN
+		PERFORM public.bump_user_dashboard_stats(OLD.user_id, 0, 0, 0, -1);
+	END IF;
+	IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.user_id IS NOT NULL THEN
+		PERFORM public.bump_user_dashboard_stats(NEW.user_id, 0, 0, 0, 1);
+	END IF;
+	RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_policies_dashboard_stats ON public.policies;
+CREATE TRIGGER trg_policies_dashboard_stats
+AFTER INSERT OR DELETE OR UPDATE OF user_id, extracted_text, validation_metadata ON public.policies
+FOR EACH ROW EXECUTE FUNCTION public.policies_dashboard_stats_trigger();
+
+DROP TRIGGER IF EXISTS trg_comparisons_dashboard_stats ON public.comparisons;
+CREATE TRIGGER trg_comparisons_dashboard_stats
+AFTER INSERT OR DELETE OR UPDATE OF user_id ON public.comparisons
+FOR EACH ROW EXECUTE FUNCTION public.comparisons_dashboard_stats_trigger();
+
+REVOKE ALL ON FUNCTION public.bump_user_dashboard_stats(uuid, int, int, int, int) FROM PUBLIC;
+
+-- Backfill from the existing rows (same counts as the dashboard_stats RPC)
+INSERT INTO public.user_dashboard_stats (user_id, uploaded, processed, analyses, comparisons)
+SELECT
+	u.user_id,
+	coalesce(p.uploaded, 0),
+	coalesce(p.processed, 0),
+	coalesce(p.analyses, 0),
+	coalesce(c.comparisons, 0)
+FROM (
+	SELECT user_id FROM public.policies WHERE user_id IS NOT NULL
+	UNION
+	SELECT user_id FROM public.comparisons WHERE user_id IS NOT NULL
+) u
+LEFT JOIN (
+	SELECT
+		user_id,
+		count(*) AS uploaded,
+		count(*) FILTER (
+			WHERE extracted_text IS NOT NULL AND length(btrim(extracted_text)) > 0
+		) AS processed,
+		count(*) FILTER (WHERE validation_metadata ? 'analysis_result') AS analyses
+	FROM public.policies
+	GROUP BY user_id
+) p ON p.user_id = u.user_id
+LEFT JOIN (
+	SELECT user_id, count(*) AS comparisons
+	FROM public.comparisons
+	GROUP BY user_id
+) c ON c.user_id = u.user_id
+ON CONFLICT (user_id) DO UPDATE SET
+	uploaded = EXCLUDED.uploaded,
+	processed = EXCLUDED.processed,
+	analyses = EXCLUDED.analyses,
+	comparisons = EXCLUDED.comparisons,
+	updated_at = now();
@@ -0,0 +1,48 @@
+-- RPC returning one page of a user's activity history plus the total count,
+-- already shaped for the /history endpoint (one round-trip instead of two).
+-- Expected params:
+--   uid uuid
+--   lim integer
+--   off integer
+
+CREATE OR REPLACE FUNCTION public.get_user_history(
+	uid uuid,
+	lim integer DEFAULT 50,
+	off integer DEFAULT 0
+)
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+	SELECT jsonb_build_object(
+		'activities', COALESCE((
+			SELECT jsonb_agg(
+				jsonb_build_object(
+					'id', page.id,
+					'type', COALESCE(page.type, 'unknown'),
+					'title', COALESCE(page.title, ''),
+					'description', COALESCE(page.description, ''),
+					'timestamp', page.created_at,
+					'status', COALESCE(page.status, 'completed'),
+					'details', COALESCE(page.details, '{}'::jsonb)
+				)
+				ORDER BY page.created_at DESC
+			)
+			FROM (
+				SELECT a.id, a.type, a.title, a.description, a.created_at, a.status, a.details
+				FROM public.activities a
+				WHERE a.user_id = uid
+				ORDER BY a.created_at DESC
+				LIMIT LEAST(GREATEST(COALESCE(lim, 50), 1), 100)
+				OFFSET GREATEST(COALESCE(off, 0), 0)
+			) page
+		), '[]'::jsonb),
+		'total_activities', (
+			SELECT count(*) FROM public.activities a WHERE a.user_id = uid
+		)
+	);
+$$;
+
+REVOKE ALL ON FUNCTION public.get_user_history(uuid, integer, integer) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.get_user_history(uuid, integer, integer) TO anon, authenticated, service_role;
@@ -5,7 +5,6 @@ Provides multi-layer caching with LRU, Redis-like features, and smart cache inva
 
 import time
 import hashlib
-import json
 import pickle
 import threading
 import os
@@ -18,6 +17,8 @@ import logging
 import asyncio
 from contextlib import asynccontextmanager
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 CACHE_PERSIST_DIR = os.getenv("CACHE_PERSIST_DIR", "")
@@ -449,7 +450,11 @@ def cached(
                 # Default key generation
                 key_data = {"func": func.__name__, "args": args, "kwargs": kwargs}
                 cache_key = hashlib.md5(
-                    json.dumps(key_data, sort_keys=True, default=str).encode()
+                    orjson.dumps(
+                        key_data,
+                        default=str,
+                        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+                    )
                 ).hexdigest()
 
             # Try to get from cache
@@ -18,7 +18,7 @@ class CircuitBreaker:
         self.recovery_timeout = recovery_timeout
 
     def call(self, service_name, fn, *args, **kwargs):
-        now = time.time()
+        now = time.monotonic()
 
         if self.state[service_name] == "OPEN":
             if (
@@ -6,21 +6,32 @@ BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 DOTENV_PATH = os.path.join(BASE_DIR, ".env")
 load_dotenv(dotenv_path=DOTENV_PATH)
 
+from supabase import ClientOptions
 from supabase.client import create_client, Client
 
 url = os.getenv("SUPABASE_URL")
 key = os.getenv("SUPABASE_KEY")
 service_role_key = os.getenv("SUPABASE_SERVICE_ROLE")
+postgrest_timeout = int(os.getenv("SUPABASE_POSTGREST_TIMEOUT", "10"))
 
 if url is None or key is None:
     raise ValueError("SUPABASE_URL and SUPABASE_KEY environment variables must be set")
 
+# Clients are module-level singletons so every request reuses the same
+# PostgREST session and its warm keep-alive connections.
+
 # Main client for database operations (uses anon key + JWT auth)
-supabase: Client = create_client(url, key)
+supabase: Client = create_client(
+    url, key, options=ClientOptions(postgrest_client_timeout=postgrest_timeout)
+)
 
 # Storage client for file operations (uses service role key for storage access)
 if service_role_key:
-    supabase_storage: Client = create_client(url, service_role_key)
+    supabase_storage: Client = create_client(
+        url,
+        service_role_key,
+        options=ClientOptions(postgrest_client_timeout=postgrest_timeout),
+    )
 else:
     import logging
 
@@ -131,7 +131,7 @@ class DocumentValidator:
         Returns:
             DocumentValidationReport with validation results
         """
-        logger.info(f"Validating document: {filename[:50]}...")
+        logger.debug("Validating document: %.50s...", filename)
         
         # Check content length
         if len(text.strip()) < self.min_content_length:
@@ -248,7 +248,7 @@ class DocumentValidator:
         else:
             doc_type = DocumentType.OTHER
             
-        logger.info(f"Document classified as {doc_type.value} with confidence {confidence:.2f}")
+        logger.debug("Document classified as %s with confidence %.2f", doc_type.value, confidence)
         return doc_type, confidence
     
     def _extract_policy_fields(self, text: str) -> Dict[str, str]:
@@ -327,7 +327,7 @@ class DocumentValidator:
                 found_fields['policy_type'] = policy_type.title()
                 break
         
-        logger.info(f"Extracted {len(found_fields)} policy fields")
+        logger.debug("Extracted %d policy fields", len(found_fields))
         return found_fields
     
     def _validate_required_fields(self, found_fields: Dict[str, str]) -> List[str]:
@@ -3,6 +3,7 @@ Enhanced embedding system for ClaimWise backend.
 Provides efficient text embedding with caching, batching, and multiple provider support.
 """
 
+import asyncio
 import logging
 import hashlib
 from typing import List, Dict, Any, Optional, Tuple
@@ -485,6 +486,51 @@ async def embed_texts(
     return await embedding_manager.embed_texts(texts, provider, use_cache)
 
 
+async def embed_texts_with_cache_async(
+    texts: List[str],
+    batch_size: int = 64,
+    concurrency: int = 16,
+    provider: Optional[str] = None,
+    use_cache: bool = True,
+) -> List[List[float]]:
+    """Embed many texts as concurrent, length-sorted micro-batches.
+
+    Similar-length texts share a batch so providers pad less, each batch is
+    cached on its own, and at most ``concurrency`` batches are in flight.
+    Embeddings are returned in the order of ``texts``.
+    """
+    if not texts:
+        return []
+
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+    batches = [order[i : i + batch_size] for i in range(0, len(order), batch_size)]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def embed_batch(indices: List[int]) -> List[List[float]]:
+        async with semaphore:
+            batch_embeddings = await embedding_manager.embed_texts(
+                [texts[i] for i in indices], provider, use_cache
+            )
+        if len(batch_embeddings) != len(indices):
+            raise ProcessingError(
+                message="Embedding count mismatch",
+                operation="embed_texts_with_cache_async",
+                details={
+                    "input_count": len(indices),
+                    "output_count": len(batch_embeddings),
+                },
+            )
+        return batch_embeddings
+
+    results = await asyncio.gather(*(embed_batch(batch) for batch in batches))
+
+    embeddings: List[Any] = [None] * len(texts)
+    for indices, batch_embeddings in zip(batches, results):
+        for i, embedding in zip(indices, batch_embeddings):
+            embeddings[i] = embedding
+    return embeddings
+
+
 async def embed_text(
     text: str, provider: Optional[str] = None, use_cache: bool = True
 ) -> List[float]:
@@ -4,11 +4,10 @@ Provides structured error categories, user-friendly messages, and recovery sugge
 """
 
 import logging
-import traceback
 from typing import Dict, List, Optional, Any, Union
 from functools import wraps
 from fastapi import HTTPException, Request, Response
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 logger = logging.getLogger(__name__)
 
@@ -232,8 +231,9 @@ def handle_exceptions(logger_instance: Optional[logging.Logger] = None):
                 raise
             except Exception as e:
                 if logger_instance:
-                    logger_instance.error(f"Unexpected error in {func.__name__}: {e}")
-                    logger_instance.debug(traceback.format_exc())
+                    logger_instance.exception(
+                        "Unexpected error in %s: %s", func.__name__, e
+                    )
 
                 # Convert to ProcessingError
                 raise ProcessingError(
@@ -254,8 +254,9 @@ def handle_exceptions(logger_instance: Optional[logging.Logger] = None):
                 raise
             except Exception as e:
                 if logger_instance:
-                    logger_instance.error(f"Unexpected error in {func.__name__}: {e}")
-                    logger_instance.debug(traceback.format_exc())
+                    logger_instance.exception(
+                        "Unexpected error in %s: %s", func.__name__, e
+                    )
 
                 # Convert to ProcessingError
                 raise ProcessingError(
@@ -275,35 +276,39 @@ def handle_exceptions(logger_instance: Optional[logging.Logger] = None):
     return decorator
 
 
+# Map error types to HTTP status codes
+ERROR_STATUS_CODES = {
+    ValidationError: 400,
+    AuthenticationError: 401,
+    AuthorizationError: 403,
+    FileHandlingError: 400,
+    RateLimitError: 429,
+    DatabaseError: 500,
+    ExternalAPIError: 502,
+    ProcessingError: 500,
+    ClaimWiseError: 500,
+}
+
+
 def convert_to_http_exception(error: ClaimWiseError) -> HTTPException:
     """Convert ClaimWise exceptions to FastAPI HTTPExceptions"""
 
-    # Map error types to HTTP status codes
-    status_code_map = {
-        ValidationError: 400,
-        AuthenticationError: 401,
-        AuthorizationError: 403,
-        FileHandlingError: 400,
-        RateLimitError: 429,
-        DatabaseError: 500,
-        ExternalAPIError: 502,
-        ProcessingError: 500,
-        ClaimWiseError: 500,
-    }
-
-    status_code = status_code_map.get(type(error), 500)
+    status_code = ERROR_STATUS_CODES.get(type(error), 500)
 
     return HTTPException(status_code=status_code, detail=error.to_dict())
 
 
 async def claimwise_exception_handler(
     request: Request, exc: ClaimWiseError
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Global exception handler for ClaimWise exceptions"""
 
     # Log the exception
     logger.error(
-        f"ClaimWise exception in {request.method} {request.url}: {exc.message}",
+        "ClaimWise exception in %s %s: %s",
+        request.method,
+        request.url.path,
+        exc.message,
         extra={
             "error_code": exc.error_code,
             "details": exc.details,
@@ -312,24 +317,11 @@ async def claimwise_exception_handler(
     )
 
     if exc.original_exception:
-        logger.debug(f"Original exception: {exc.original_exception}")
-
-    # Map error types to HTTP status codes
-    status_code_map = {
-        ValidationError: 400,
-        AuthenticationError: 401,
-        AuthorizationError: 403,
-        FileHandlingError: 400,
-        RateLimitError: 429,
-        DatabaseError: 500,
-        ExternalAPIError: 502,
-        ProcessingError: 500,
-        ClaimWiseError: 500,
-    }
-
-    status_code = status_code_map.get(type(exc), 500)
-
-    return JSONResponse(status_code=status_code, content=exc.to_dict())
+        logger.debug("Original exception: %s", exc.original_exception)
+
+    status_code = ERROR_STATUS_CODES.get(type(exc), 500)
+
+    return ORJSONResponse(status_code=status_code, content=exc.to_dict())
 
 
 # Predefined error instances for common scenarios
@@ -1,3 +1,4 @@
+import io
 import os 
 import time 
 import requests
@@ -25,9 +26,6 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 # Base URL for Gemini Files API (kept for backward compatibility but SDK is preferred)
 GEMINI_API_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/files"
 
-# Configuring logging
-logging.basicConfig(level=logging.INFO)
-
 # Initialize the client if possible. Make this import-safe so the module can be
 # imported even when the GEMINI_API_KEY or the google.genai SDK is not present.
 client = None
@@ -98,13 +96,13 @@ def poll_file_status(file_id: str, timeout: int = 300, interval: int = 5) -> str
 
     logging.info("Polling file status for File ID: %s", file_id)
 
-    start_time = time.time()
+    start_time = time.monotonic()
     # If client is not configured or we used the local sentinel, treat as ACTIVE
     if client is None or file_id == "local":
         logging.info("Gemini client not configured or local sentinel used; assuming file is ACTIVE")
         return "ACTIVE"
 
-    while time.time() - start_time < timeout:
+    while time.monotonic() - start_time < timeout:
         try:
             # Use SDK to fetch file metadata instead of constructing raw URLs
             resp = client.files.get(name=file_id)
@@ -184,6 +182,20 @@ def extract_text(file_path: str) -> str:
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Local file not found: {file_path}")
 
+    return _extract_pdf_text(file_path)
+
+
+def extract_text_from_bytes(data: bytes) -> str:
+    """
+    Extract text from an in-memory PDF using PyPDF2, without touching disk.
+
+    Same behaviour and errors as ``extract_text``, minus the path check.
+    """
+    logging.info("Extracting text from in-memory PDF (%d bytes)", len(data))
+    return _extract_pdf_text(io.BytesIO(data))
+
+
+def _extract_pdf_text(source) -> str:
     # Ensure PyPDF2 is available
     if PdfReader is None:
         logging.error("PyPDF2 is not installed; cannot perform local extraction. Please install PyPDF2.")
@@ -191,7 +203,7 @@ def extract_text(file_path: str) -> str:
 
     # Extract text using PyPDF2 only
     try:
-        reader = PdfReader(file_path)
+        reader = PdfReader(source)
         texts = []
         
         for page_num, page in enumerate(reader.pages):
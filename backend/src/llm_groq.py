@@ -4,6 +4,7 @@ import re
 import time
 import logging
 from datetime import datetime, timedelta
+from itertools import islice
 from typing import Optional, List
 
 from src.circuit_breaker import circuit_breaker, CircuitBreakerOpen
@@ -36,6 +37,11 @@ openai_api_key = os.getenv("OPENAI_API_KEY")  # For OpenAI free tier
 anthropic_api_key = os.getenv("ANTHROPIC_API_KEY")  # For Claude free tier
 together_api_key = os.getenv("TOGETHER_API_KEY")  # For Together.ai free tier
 
+_AMOUNT_RE = re.compile(
+    r"₹[\d,]+|rs\.?\s*[\d,]+|inr\s*[\d,]+|\d+\s*lakh|\d+\s*crore"
+)
+_NUMBER_RE = re.compile(r"[\d,]+")
+
 # Primary: Groq client
 # Initialize Groq/OpenAI-compatible client only if the OpenAI SDK is available
 groq_client = None
@@ -268,12 +274,8 @@ def generate_rule_based_analysis(prompt: str) -> str:
             provider = p.title()
             break
 
-    # Try to extract amounts
-    import re
-
-    amounts = re.findall(
-        r"₹[\d,]+|rs\.?\s*[\d,]+|inr\s*[\d,]+|\d+\s*lakh|\d+\s*crore", text_lower
-    )
+    # Try to extract amounts (only the first two are used)
+    amounts = [m.group(0) for m in islice(_AMOUNT_RE.finditer(text_lower), 2)]
     coverage_amount = amounts[0] if amounts else "Coverage amount not specified"
     premium = amounts[1] if len(amounts) > 1 else "Premium not specified"
 
@@ -402,11 +404,9 @@ def validate_and_clean_analysis(result: dict, original_text: str) -> dict:
             # Ensure proper Indian rupee formatting
             if not value.startswith("₹") and any(char.isdigit() for char in value):
                 # Try to extract numbers and format properly
-                import re
-
-                numbers = re.findall(r"[\d,]+", value)
-                if numbers:
-                    number_str = numbers[0].replace(",", "")
+                number = _NUMBER_RE.search(value)
+                if number:
+                    number_str = number.group(0).replace(",", "")
                     try:
                         amount = int(number_str)
                         # Format in Indian numbering system
@@ -1,30 +1,81 @@
 import asyncio
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+
+import anyio.to_thread
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 import os
+import queue
 import logging
+import logging.handlers
 
-load_dotenv()
-
-from src.db import supabase, supabase_storage
+# src.db loads backend/.env once; everything below reads settings after it.
+import src.db  # noqa: F401
 from fastapi.middleware.cors import CORSMiddleware
-from src.monitoring import performance_middleware, start_monitoring
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from src.monitoring import (
+    PerformanceMiddleware,
+    TraceIdFilter,
+    start_monitoring,
+    stop_monitoring,
+)
 from src.exceptions import ClaimWiseError, claimwise_exception_handler
+from src.services.activity_service import (
+    start_activity_flusher,
+    stop_activity_flusher,
+)
 
 from src.routes.monitoring import router as monitoring_router
-from src.routes.policies import router as policies_router
+from src.routes.policies import router as policies_router, extraction_pool
 from src.routes.analysis import router as analysis_router
 from src.routes.chat import router as chat_router
 from src.routes.dashboard import router as dashboard_router
 from src.routes.admin import router as admin_router
 from src.routes.auth import router as auth_router
 
-logging.basicConfig(level=logging.INFO)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = "%(levelname)s:%(name)s:[%(trace_id)s] %(message)s"
+# Optional rotating log file, written by the listener thread alongside stderr
+LOG_FILE = os.getenv("LOG_FILE", "")
+
+
+def _configure_logging() -> logging.handlers.QueueListener:
+    """Route all records through a queue so request handlers never block on I/O."""
+    log_queue: queue.Queue = queue.Queue(-1)
+    formatter = logging.Formatter(LOG_FORMAT)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+    handlers: list[logging.Handler] = [stream_handler]
+    if LOG_FILE:
+        os.makedirs(os.path.dirname(LOG_FILE) or ".", exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            LOG_FILE, maxBytes=50_000_000, backupCount=5
+        )
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    # The trace id lives in a ContextVar, so it must be read on the logging
+    # thread, before the record crosses the queue to the listener.
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(TraceIdFilter())
+    root_logger = logging.getLogger()
+    root_logger.handlers[:] = [queue_handler]
+    root_logger.setLevel(LOG_LEVEL)
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    return listener
+
+
+log_listener = _configure_logging()
 
 REQUEST_TIMEOUT_SECONDS = int(os.getenv("REQUEST_TIMEOUT_SECONDS", "120"))
+# Sync routes (anyio) and asyncio.to_thread both block on Supabase calls;
+# the stock pools (40 and min(32, cpus + 4)) saturate quickly.
+WORKER_THREADS = int(os.getenv("WORKER_THREADS", "100"))
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 app.add_exception_handler(ClaimWiseError, claimwise_exception_handler)
 
 frontend_url = os.getenv("FRONTEND_URL", "https://claimwise-fht9.vercel.app")
@@ -44,24 +95,55 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Policy text, chat and metrics payloads are large, highly compressible JSON
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
+# Only enforce Host checks when explicitly configured; a "*" allow-list
+# would just add a no-op layer to every request.
+allowed_hosts = [
+    host.strip() for host in os.getenv("ALLOWED_HOSTS", "").split(",") if host.strip()
+]
+if allowed_hosts:
+    app.add_middleware(TrustedHostMiddleware, allowed_hosts=allowed_hosts)
 
-async def timeout_middleware(request: Request, call_next):
-    try:
-        response = await asyncio.wait_for(
-            call_next(request), timeout=REQUEST_TIMEOUT_SECONDS
-        )
-        return response
-    except asyncio.TimeoutError:
-        logging.error("Request timeout on %s %s", request.method, request.url.path)
-        return JSONResponse(
-            status_code=504,
-            content={"detail": "Request timed out. Please try again."},
-        )
 
+class TimeoutMiddleware:
+    """Pure ASGI request timeout; answers 504 if no response has started yet."""
+
+    def __init__(self, app, timeout: float):
+        self.app = app
+        self.timeout = timeout
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
 
-app.middleware("http")(timeout_middleware)
-app.middleware("http")(performance_middleware())
+        try:
+            await asyncio.wait_for(
+                self.app(scope, receive, send_wrapper), timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            logging.error("Request timeout on %s %s", scope["method"], scope["path"])
+            if response_started:
+                raise
+            response = ORJSONResponse(
+                status_code=504,
+                content={"detail": "Request timed out. Please try again."},
+            )
+            await response(scope, receive, send)
+
+
+app.add_middleware(TimeoutMiddleware, timeout=REQUEST_TIMEOUT_SECONDS)
+app.add_middleware(PerformanceMiddleware)
 
 app.include_router(monitoring_router)
 app.include_router(policies_router)
@@ -72,6 +154,39 @@ app.include_router(admin_router)
 app.include_router(auth_router)
 
 
+@app.on_event("startup")
+async def startup_thread_pools() -> None:
+    anyio.to_thread.current_default_thread_limiter().total_tokens = WORKER_THREADS
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=WORKER_THREADS, thread_name_prefix="worker")
+    )
+
+
 @app.on_event("startup")
 async def startup_monitoring() -> None:
     start_monitoring()
+
+
+@app.on_event("startup")
+async def startup_activity_flusher() -> None:
+    start_activity_flusher()
+
+
+@app.on_event("shutdown")
+async def shutdown_monitoring() -> None:
+    await stop_monitoring()
+
+
+@app.on_event("shutdown")
+async def drain_activity_flusher() -> None:
+    await asyncio.to_thread(stop_activity_flusher)
+
+
+@app.on_event("shutdown")
+async def stop_extraction_pool() -> None:
+    extraction_pool.shutdown(wait=False, cancel_futures=True)
+
+
+@app.on_event("shutdown")
+async def stop_log_listener() -> None:
+    log_listener.stop()
@@ -1,25 +1,35 @@
 import os
+import re
 import logging
-from typing import Any
+from typing import Any, Dict, Optional
 
 from fastapi import HTTPException
 from src.db import supabase
 from src.rate_limiting import rate_limiter
+from src.caching import cache_manager
 
 
 APP_ENV = os.getenv("APP_ENV", os.getenv("ENVIRONMENT", "development")).lower()
 ALLOW_DEBUG_ROUTES = os.getenv("ALLOW_DEBUG_ROUTES", "false").lower() == "true"
+POLICY_CACHE_TTL_SECONDS = int(os.getenv("POLICY_CACHE_TTL_SECONDS", "600"))
+POLICY_CONTENT_FIELDS = "extracted_text,policy_number,policy_name,user_id"
+TEST_DATA_SENTINEL = re.compile(
+    r"test insurance policy for automated testing", re.IGNORECASE
+)
 
 
-def _configured_admin_user_ids() -> set[str]:
-    raw_ids = os.getenv("CLAIMWISE_ADMIN_USER_IDS", "")
-    return {admin_id.strip() for admin_id in raw_ids.split(",") if admin_id.strip()}
+# Parsed once at import; checked on every admin-gated request
+CONFIGURED_ADMIN_USER_IDS = frozenset(
+    admin_id.strip()
+    for admin_id in os.getenv("CLAIMWISE_ADMIN_USER_IDS", "").split(",")
+    if admin_id.strip()
+)
 
 
 def _is_admin_user(user_id: str) -> bool:
     if not user_id:
         return False
-    if user_id in _configured_admin_user_ids():
+    if user_id in CONFIGURED_ADMIN_USER_IDS:
         return True
     try:
         role_row = (
@@ -59,6 +69,50 @@ def _enforce_user_rate_limit(limit_name: str, user_id: str, endpoint: str) -> No
         )
 
 
+def _policy_cache():
+    return cache_manager.create_cache(
+        "policy_content", max_size=1000, default_ttl=POLICY_CACHE_TTL_SECONDS
+    )
+
+
+def _load_policy(policy_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+    """Return the immutable content columns of a policy owned by ``user_id``.
+
+    Rows are cached by policy id only; ownership is checked after the lookup so
+    repeated chats/analyses skip the round-trip without leaking across users.
+    """
+    cache = _policy_cache()
+    cache_key = f"policy:{policy_id}"
+    policy = cache.get(cache_key)
+    if policy is None:
+        result = (
+            supabase.table("policies")
+            .select(POLICY_CONTENT_FIELDS)
+            .eq("id", policy_id)
+            .limit(1)
+            .execute()
+        )
+        if not result.data:
+            return None
+        policy = result.data[0]
+        cache.set(cache_key, policy)
+    if policy.get("user_id") != user_id:
+        return None
+    return policy
+
+
+def _invalidate_policy_cache(policy_id: str) -> None:
+    _policy_cache().delete(f"policy:{policy_id}")
+
+
+def _invalidate_dashboard_stats(user_id: str) -> None:
+    cache_manager.create_cache("dashboard", default_ttl=60).delete(f"stats:{user_id}")
+
+
+def _is_test_data(extracted_text: Optional[str]) -> bool:
+    return bool(extracted_text and TEST_DATA_SENTINEL.search(extracted_text))
+
+
 def _require_debug_routes_enabled() -> None:
     if APP_ENV == "production" and not ALLOW_DEBUG_ROUTES:
         raise HTTPException(status_code=404, detail="Not found")
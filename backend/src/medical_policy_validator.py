@@ -15,14 +15,39 @@ Author: ClaimWise AI System
 """
 
 import re
+import copy
+import hashlib
 import logging
-from typing import Dict, List, Tuple, Optional, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Optional, Any, Sequence
 from enum import Enum
 from dataclasses import dataclass
 import json
 
+import numpy as np
+
+from src.caching import cache_manager
+
+# Field patterns run over user-supplied PDF text; prefer RE2's linear-time
+# matcher when installed so a future pattern edit cannot introduce ReDoS.
+try:
+    import re2 as _field_re
+except ImportError:
+    _field_re = re
+
 logger = logging.getLogger(__name__)
 
+try:
+    from src.llm_groq import groq_client
+except Exception as e:  # missing SDK/config: classify with keywords only
+    logger.warning("Groq client unavailable, using keyword classification: %s", e)
+    groq_client = None
+
+# Re-uploads and retries of the same text skip the LLM round trip
+VALIDATION_CACHE_SIZE = 512
+
 class DocumentCategory(str, Enum):
     """Document classification categories"""
     MEDICAL_POLICY = "Medical Policy"
@@ -39,7 +64,7 @@ class ValidationResult(str, Enum):
     INVALID_INCOMPLETE_POLICY = "invalid_incomplete_policy"
     INVALID_LOW_CONFIDENCE = "invalid_low_confidence"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ValidationReport:
     """Comprehensive validation report"""
     is_valid: bool
@@ -51,7 +76,131 @@ class ValidationReport:
     missing_fields: List[str]
     error_message: str
     user_friendly_message: str
-    suggestions: List[str]
+    suggestions: Sequence[str]
+
+# Error-path suggestions are shared, immutable and built once at import
+PROCESSING_ERROR_SUGGESTIONS = (
+    "Ensure the file is a valid PDF document",
+    "Check that the file is not corrupted or password protected",
+    "Try uploading a different medical insurance policy document",
+)
+INSUFFICIENT_KEYWORDS_SUGGESTIONS = (
+    "Ensure you're uploading a medical insurance policy document",
+    "Look for documents containing policy numbers, coverage details, and premium information",
+    "Avoid uploading medical records, tickets, invoices, or other non-policy documents",
+)
+INCOMPLETE_POLICY_SUGGESTIONS = (
+    "Upload a complete medical insurance policy document",
+    "Ensure the document includes policy number, provider details, and coverage information",
+    "Contact your insurance provider if you need a complete policy document",
+)
+LOW_CONFIDENCE_SUGGESTIONS = (
+    "Ensure you're uploading a complete medical insurance policy",
+    "Check that the document is clearly readable and not corrupted",
+    "Try uploading the original policy document from your insurance provider",
+)
+# Per-category messages for documents classified as something other than a policy
+_NOT_POLICY_MESSAGES = {
+    category: (
+        f"Document classified as '{category.value}' rather than a medical insurance policy.",
+        f"This appears to be a {category.value.lower()} document, not a medical insurance policy.",
+        (
+            f"Upload medical insurance policy documents instead of {category.value.lower()}s",
+            "Ensure the document contains policy terms, coverage details, and premium information",
+            "Contact your insurance provider for official policy documents",
+        ),
+    )
+    for category in DocumentCategory
+}
+
+
+def _compile_field_patterns(fields: Dict[str, List[str]], engine=_field_re) -> Dict[str, List[Any]]:
+    """Compile each field's alternatives case-insensitively with ``engine`` (re2 or re)."""
+    # Inline (?i) works with both re and re2
+    return {
+        name: [engine.compile("(?i)" + p) for p in patterns]
+        for name, patterns in fields.items()
+    }
+
+
+def _final_category_names(names) -> frozenset:
+    """Category names that no other category name extends."""
+    return frozenset(
+        name for name in names
+        if not any(other != name and other.startswith(name) for other in names)
+    )
+
+
+_ASCII_LOWER = bytes.maketrans(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", b"abcdefghijklmnopqrstuvwxyz"
+)
+
+
+class _SemanticClassificationCache:
+    """
+    Near-duplicate lookup for LLM classification results.
+
+    Insurer templates differ mostly in names and numbers, so documents are
+    embedded locally as L2-normalised hashed word + bigram counts and an LLM
+    answer is reused when cosine similarity to a previous prompt is high.
+    """
+
+    _TOKEN_RE = re.compile(r"[a-z]+")
+
+    def __init__(
+        self,
+        capacity: int = 2048,
+        dim: int = 1024,
+        threshold: float = 0.95,
+        ttl_seconds: float = 3600.0,
+    ):
+        self.capacity = capacity
+        self.dim = dim
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        # time.monotonic() after which each entry is ignored
+        self._expires = np.zeros(capacity, dtype=np.float64)
+        self._categories: List[Optional["DocumentCategory"]] = [None] * capacity
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def embed(self, text_lower: str) -> Optional[np.ndarray]:
+        # Letters only: policy numbers, dates and amounts should not make
+        # two copies of the same template look different
+        tokens = self._TOKEN_RE.findall(text_lower)
+        if not tokens:
+            return None
+        features = tokens + [a + " " + b for a, b in zip(tokens, tokens[1:])]
+        vec = np.bincount(
+            [hash(f) % self.dim for f in features], minlength=self.dim
+        ).astype(np.float32)
+        return vec / np.linalg.norm(vec)
+
+    def lookup(self, vec: np.ndarray) -> Optional["DocumentCategory"]:
+        with self._lock:
+            if not self._size:
+                return None
+            sims = self._vectors[: self._size] @ vec
+            sims[self._expires[: self._size] <= time.monotonic()] = -1.0
+            best = int(sims.argmax())
+            if sims[best] >= self.threshold:
+                return self._categories[best]
+        return None
+
+    def add(self, vec: np.ndarray, category: "DocumentCategory") -> None:
+        with self._lock:
+            # Ring buffer: once full, overwrite the oldest entry
+            self._vectors[self._next] = vec
+            self._categories[self._next] = category
+            self._expires[self._next] = time.monotonic() + self.ttl_seconds
+            self._next = (self._next + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+
+_classification_cache = _SemanticClassificationCache()
+
 
 class MedicalPolicyValidator:
     """
@@ -65,36 +214,78 @@ class MedicalPolicyValidator:
         "medical insurance", "health insurance", "cashless", "co-payment",
         "deductible", "expiry date", "effective date", "provider network"
     ]
+    _REQUIRED_KEYWORD_BYTES = [kw.encode("ascii") for kw in REQUIRED_KEYWORDS]
+    
+    # Documents with this many required keywords, including all of the
+    # must-have ones, are policies without asking the LLM
+    FAST_PATH_MIN_KEYWORDS = 8
+    FAST_PATH_REQUIRED_KEYWORDS = frozenset({"policy number", "sum insured", "premium"})
     
     # Stage 4: Mandatory fields for complete policy validation
     MANDATORY_FIELDS = {
         'policy_number': [r'policy\s*(?:no|number|#)[\s:]*([A-Z0-9\-/]+)', r'policy[\s:]+([A-Z0-9\-/]{6,})'],
-        'provider_name': [r'insurance\s*company[\s:]*([A-Za-z\s&]+)', r'insurer[\s:]*([A-Za-z\s&]+)'],
+        # Names start with a letter (so the separator and capture never overlap),
+        # stay on one line and are length-bounded to keep matching linear
+        'provider_name': [r'insurance\s*company[\s:]*([A-Za-z&][A-Za-z \t&]{0,79})', r'insurer[\s:]*([A-Za-z&][A-Za-z \t&]{0,79})'],
         'sum_insured': [r'sum\s*insured[\s:]*₹?\s*([0-9,]+)', r'coverage\s*amount[\s:]*₹?\s*([0-9,]+)'],
         'premium_amount': [r'premium[\s:]*₹?\s*([0-9,]+)', r'annual\s*premium[\s:]*₹?\s*([0-9,]+)'],
-        'policy_holder': [r'policy\s*holder[\s:]*([A-Za-z\s]+)', r'insured\s*person[\s:]*([A-Za-z\s]+)'],
+        'policy_holder': [r'policy\s*holder[\s:]*([A-Za-z][A-Za-z \t]{0,59})', r'insured\s*person[\s:]*([A-Za-z][A-Za-z \t]{0,59})'],
         'expiry_date': [r'expiry[\s:]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', r'valid\s*till[\s:]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})']
     }
+    # Mandatory fields sit on the policy schedule in the first pages; only
+    # this many leading characters are searched for them
+    FIELD_SEARCH_CHARS = 20000
+    # One compiled pattern per alternative, tried in order. A single combined
+    # alternation measured ~2x slower with Python's re and would let one
+    # field's match consume text another field needs.
+    _COMPILED_FIELDS = _compile_field_patterns(MANDATORY_FIELDS)
+    _FIELD_LABELS = {name: name.replace('_', ' ').title() for name in MANDATORY_FIELDS}
+    # Confidence weights: fields are worth 60 points in total, keywords 40
+    _POINTS_PER_FIELD = 60.0 / len(MANDATORY_FIELDS)
+    _POINTS_PER_KEYWORD = 40.0 / len(REQUIRED_KEYWORDS)
+    
+    # Fallback classification keywords (lowercase), used when the LLM is unavailable
+    CLASSIFICATION_KEYWORDS = {
+        DocumentCategory.MEDICAL_POLICY: [
+            'insurance policy', 'policy number', 'sum insured', 'premium',
+            'cashless', 'co-payment', 'deductible', 'policy holder'
+        ],
+        DocumentCategory.HEALTH_RECORD: [
+            'patient', 'diagnosis', 'prescription', 'medical history',
+            'doctor', 'hospital admission', 'lab report'
+        ],
+        DocumentCategory.TRAVEL_TICKET: [
+            'flight', 'train', 'bus ticket', 'departure', 'arrival',
+            'passenger', 'seat number', 'boarding pass'
+        ],
+        DocumentCategory.INVOICE: [
+            'invoice', 'bill', 'receipt', 'amount due', 'payment',
+            'invoice number', 'tax', 'total amount'
+        ]
+    }
     
-    # LLM Classification prompt
-    CLASSIFICATION_PROMPT = """
-    Analyze the following document text and classify it into exactly one of these categories:
+    # LLM Classification prompt. The instructions are a fixed system message
+    # (never formatted) so the provider can reuse the cached prefix; only the
+    # user message varies per document.
+    CLASSIFICATION_INSTRUCTIONS = """
+    Classify the document text you are given into exactly one of these categories:
     - Medical Policy: Medical/health insurance policy documents
     - Health Record: Medical records, prescriptions, lab reports
     - Travel Ticket: Flight, train, bus tickets or travel documents
     - Invoice: Bills, receipts, invoices for any services/products
     - Others: Any other type of document
     
-    Document text:
-    {text}
-    
     Instructions:
     - Read the document carefully
     - Return ONLY the category name from the list above
     - Do not provide explanations or additional text
     - Be strict: only classify as "Medical Policy" if it's clearly an insurance policy document
-    
-    Category:"""
+    """
+    CLASSIFICATION_USER_TEMPLATE = "Document text:\n{text}\n\nCategory:"
+    # LLM answer -> category
+    CATEGORY_NAMES = {category.value: category for category in DocumentCategory}
+    # The streamed answer may stop early only on a name no other name extends
+    FINAL_CATEGORY_NAMES = _final_category_names(CATEGORY_NAMES)
     
     def __init__(self, min_keywords_required: int = 3, min_confidence_threshold: float = 60.0):
         """
@@ -118,108 +309,27 @@ class MedicalPolicyValidator:
         Returns:
             ValidationReport with complete validation results
         """
-        logger.info(f"Starting validation pipeline for document: {filename}")
+        logger.debug("Starting validation pipeline for document: %s", filename)
+        
+        cache = cache_manager.create_cache(
+            "validation_reports", max_size=VALIDATION_CACHE_SIZE, default_ttl=3600
+        )
+        # Reports depend only on the text and the thresholds, not the filename
+        text_hash = hashlib.blake2b(
+            text.encode("utf-8", "surrogatepass"), digest_size=16
+        ).hexdigest()
+        cache_key = "%s:%s:%s" % (
+            text_hash, self.min_keywords_required, self.min_confidence_threshold
+        )
+        cached_report = cache.get(cache_key)
+        if cached_report is not None:
+            logger.debug("Validation cache hit for document: %s", filename)
+            return copy.deepcopy(cached_report)
         
         try:
-            # Stage 1: Keyword Pre-Check (fast filter)
-            logger.info("Stage 1: Running keyword pre-check...")
-            keywords_result = self._keyword_precheck(text)
-            
-            if not keywords_result['passed']:
-                return self._create_error_report(
-                    ValidationResult.INVALID_INSUFFICIENT_KEYWORDS,
-                    DocumentCategory.OTHERS,
-                    keywords_result['found_keywords'],
-                    {},
-                    "Uploaded file is not a valid medical insurance policy.",
-                    "The document doesn't contain enough medical insurance policy keywords.",
-                    [
-                        "Ensure you're uploading a medical insurance policy document",
-                        "Look for documents containing policy numbers, coverage details, and premium information",
-                        "Avoid uploading medical records, tickets, invoices, or other non-policy documents"
-                    ]
-                )
-            
-            # Stage 2: LLM-based Document Classification
-            logger.info("Stage 2: Running LLM classification...")
-            classification_result = self._classify_document(text[:3000])  # First 3000 chars for LLM
-            
-            if classification_result['category'] != DocumentCategory.MEDICAL_POLICY:
-                return self._create_error_report(
-                    ValidationResult.INVALID_NOT_POLICY,
-                    classification_result['category'],
-                    keywords_result['found_keywords'],
-                    {},
-                    f"Document classified as '{classification_result['category'].value}' rather than a medical insurance policy.",
-                    f"This appears to be a {classification_result['category'].value.lower()} document, not a medical insurance policy.",
-                    [
-                        f"Upload medical insurance policy documents instead of {classification_result['category'].value.lower()}s",
-                        "Ensure the document contains policy terms, coverage details, and premium information",
-                        "Contact your insurance provider for official policy documents"
-                    ]
-                )
-            
-            # Stage 3: Field Extraction & Validation
-            logger.info("Stage 3: Extracting and validating fields...")
-            extraction_result = self._extract_fields(text)
-            
-            # Stage 4: Confidence Scoring
-            logger.info("Stage 4: Calculating confidence score...")
-            confidence_result = self._calculate_confidence(
-                extraction_result['extracted_fields'],
-                keywords_result['found_keywords']
-            )
-            
-            # Check if document has enough mandatory fields
-            if len(extraction_result['missing_fields']) > 3:  # Allow missing up to 3 fields
-                return self._create_error_report(
-                    ValidationResult.INVALID_INCOMPLETE_POLICY,
-                    DocumentCategory.MEDICAL_POLICY,
-                    keywords_result['found_keywords'],
-                    extraction_result['extracted_fields'],
-                    "Document incomplete or not a valid medical insurance policy.",
-                    f"Missing critical policy information: {', '.join(extraction_result['missing_fields'][:3])}",
-                    [
-                        "Upload a complete medical insurance policy document",
-                        "Ensure the document includes policy number, provider details, and coverage information",
-                        "Contact your insurance provider if you need a complete policy document"
-                    ]
-                )
-            
-            # Check confidence threshold
-            if confidence_result['score'] < self.min_confidence_threshold:
-                return self._create_error_report(
-                    ValidationResult.INVALID_LOW_CONFIDENCE,
-                    DocumentCategory.MEDICAL_POLICY,
-                    keywords_result['found_keywords'],
-                    extraction_result['extracted_fields'],
-                    f"Document validation confidence too low ({confidence_result['score']:.1f}%).",
-                    "The document may be incomplete or not a standard medical insurance policy format.",
-                    [
-                        "Ensure you're uploading a complete medical insurance policy",
-                        "Check that the document is clearly readable and not corrupted",
-                        "Try uploading the original policy document from your insurance provider"
-                    ]
-                )
-            
-            # SUCCESS: Document passed all validation stages
-            logger.info(f"Document validation successful with {confidence_result['score']:.1f}% confidence")
-            
-            return ValidationReport(
-                is_valid=True,
-                result=ValidationResult.VALID_POLICY,
-                category=DocumentCategory.MEDICAL_POLICY,
-                confidence_score=confidence_result['score'],
-                found_keywords=keywords_result['found_keywords'],
-                extracted_fields=extraction_result['extracted_fields'],
-                missing_fields=extraction_result['missing_fields'],
-                error_message="",
-                user_friendly_message=f"Valid medical insurance policy detected ({confidence_result['score']:.1f}% confidence)",
-                suggestions=[]
-            )
-            
+            report, used_fallback = self._run_pipeline(text)
         except Exception as e:
-            logger.error(f"Validation pipeline error: {e}")
+            logger.error("Validation pipeline error: %s", e)
             return self._create_error_report(
                 ValidationResult.INVALID_NOT_POLICY,
                 DocumentCategory.OTHERS,
@@ -227,28 +337,166 @@ class MedicalPolicyValidator:
                 {},
                 "Document validation failed due to processing error.",
                 "Unable to process the uploaded document. Please try again with a different file.",
-                [
-                    "Ensure the file is a valid PDF document",
-                    "Check that the file is not corrupted or password protected",
-                    "Try uploading a different medical insurance policy document"
-                ]
+                PROCESSING_ERROR_SUGGESTIONS
             )
+        # Processing errors and keyword-fallback verdicts are not cached, so a
+        # retry runs the pipeline (and the LLM, once it recovers) again
+        if used_fallback:
+            return report
+        cache.set(cache_key, report)
+        return copy.deepcopy(report)
+    
+    def validate_documents_bulk(
+        self,
+        texts: List[str],
+        filenames: Optional[List[str]] = None,
+        max_workers: int = 8,
+    ) -> List[ValidationReport]:
+        """
+        Validate several documents concurrently
+        
+        Each document runs the full pipeline in a worker thread, so the
+        blocking Groq classification calls overlap and N documents cost
+        roughly one LLM round trip of wall time instead of N.
+        
+        Args:
+            texts: Extracted PDF text for each document
+            filenames: Optional filenames, aligned with ``texts``
+            max_workers: Upper bound on concurrent validations
+            
+        Returns:
+            ValidationReports in the same order as ``texts``
+        """
+        if not texts:
+            return []
+        names = filenames or [""] * len(texts)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(texts))) as pool:
+            return list(pool.map(self.validate_document, texts, names))
+    
+    def _run_pipeline(self, text: str) -> Tuple[ValidationReport, bool]:
+        """
+        Run validation stages 1-4 on ``text``
+
+        Returns the report and whether stage 2 fell back to keyword classification
+        """
+        # Stage 1: Keyword Pre-Check (fast filter)
+        logger.debug("Stage 1: Running keyword pre-check...")
+        keywords_result = self._keyword_precheck(text)
+        # The classifier and its keyword fallback only see this prefix
+        classify_lower = text[:3000].lower()
+        
+        if not keywords_result['passed']:
+            return self._create_error_report(
+                ValidationResult.INVALID_INSUFFICIENT_KEYWORDS,
+                DocumentCategory.OTHERS,
+                keywords_result['found_keywords'],
+                {},
+                "Uploaded file is not a valid medical insurance policy.",
+                "The document doesn't contain enough medical insurance policy keywords.",
+                INSUFFICIENT_KEYWORDS_SUGGESTIONS
+            ), False
+        
+        # Stage 2: LLM-based Document Classification, skipped when the
+        # keywords alone already identify a policy
+        found = set(keywords_result['found_keywords'])
+        if (
+            len(found) >= self.FAST_PATH_MIN_KEYWORDS
+            and self.FAST_PATH_REQUIRED_KEYWORDS <= found
+        ):
+            logger.debug("Stage 2: Keyword fast path, skipping LLM classification")
+            classification_result = {
+                'category': DocumentCategory.MEDICAL_POLICY,
+                'raw_response': 'keyword-fast-path'
+            }
+        else:
+            logger.debug("Stage 2: Running LLM classification...")
+            classification_result = self._classify_document(
+                text[:3000], classify_lower  # First 3000 chars for LLM
+            )
+        
+        category = classification_result['category']
+        used_fallback = classification_result.get('fallback', False)
+        if category != DocumentCategory.MEDICAL_POLICY:
+            error_message, user_message, suggestions = _NOT_POLICY_MESSAGES[category]
+            return self._create_error_report(
+                ValidationResult.INVALID_NOT_POLICY,
+                category,
+                keywords_result['found_keywords'],
+                {},
+                error_message,
+                user_message,
+                suggestions
+            ), used_fallback
+        
+        # Stage 3: Field Extraction & Validation
+        logger.debug("Stage 3: Extracting and validating fields...")
+        extraction_result = self._extract_fields(text)
+        
+        # Stage 4: Confidence Scoring
+        logger.debug("Stage 4: Calculating confidence score...")
+        confidence_result = self._calculate_confidence(
+            extraction_result['extracted_fields'],
+            keywords_result['found_keywords']
+        )
+        
+        # Check if document has enough mandatory fields
+        if len(extraction_result['missing_fields']) > 3:  # Allow missing up to 3 fields
+            return self._create_error_report(
+                ValidationResult.INVALID_INCOMPLETE_POLICY,
+                DocumentCategory.MEDICAL_POLICY,
+                keywords_result['found_keywords'],
+                extraction_result['extracted_fields'],
+                "Document incomplete or not a valid medical insurance policy.",
+                f"Missing critical policy information: {', '.join(extraction_result['missing_fields'][:3])}",
+                INCOMPLETE_POLICY_SUGGESTIONS
+            ), used_fallback
+        
+        # Check confidence threshold
+        if confidence_result['score'] < self.min_confidence_threshold:
+            return self._create_error_report(
+                ValidationResult.INVALID_LOW_CONFIDENCE,
+                DocumentCategory.MEDICAL_POLICY,
+                keywords_result['found_keywords'],
+                extraction_result['extracted_fields'],
+                f"Document validation confidence too low ({confidence_result['score']:.1f}%).",
+                "The document may be incomplete or not a standard medical insurance policy format.",
+                LOW_CONFIDENCE_SUGGESTIONS
+            ), used_fallback
+        
+        # SUCCESS: Document passed all validation stages
+        logger.info("Document validation successful with %.1f%% confidence", confidence_result['score'])
+        
+        return ValidationReport(
+            is_valid=True,
+            result=ValidationResult.VALID_POLICY,
+            category=DocumentCategory.MEDICAL_POLICY,
+            confidence_score=confidence_result['score'],
+            found_keywords=keywords_result['found_keywords'],
+            extracted_fields=extraction_result['extracted_fields'],
+            missing_fields=extraction_result['missing_fields'],
+            error_message="",
+            user_friendly_message=f"Valid medical insurance policy detected ({confidence_result['score']:.1f}% confidence)",
+            suggestions=()
+        ), used_fallback
     
     def _keyword_precheck(self, text: str) -> Dict[str, Any]:
         """
         Stage 1: Fast keyword-based filtering
         Scans for medical insurance policy keywords
         """
-        text_lower = text.lower()
-        found_keywords = []
-        
-        for keyword in self.REQUIRED_KEYWORDS:
-            if keyword.lower() in text_lower:
-                found_keywords.append(keyword)
+        # Keywords are ASCII, so fold the text to lowercase ASCII bytes once.
+        # Any non-ASCII character (e.g. the rupee sign) would otherwise make
+        # the whole str 2-4 bytes per char and every ``in`` scan slower.
+        text_bytes = text.encode("ascii", "ignore").translate(_ASCII_LOWER)
+        found_keywords = [
+            kw
+            for kw, kw_bytes in zip(self.REQUIRED_KEYWORDS, self._REQUIRED_KEYWORD_BYTES)
+            if kw_bytes in text_bytes
+        ]
         
         passed = len(found_keywords) >= self.min_keywords_required
         
-        logger.info(f"Keyword precheck: {len(found_keywords)}/{len(self.REQUIRED_KEYWORDS)} keywords found")
+        logger.debug("Keyword precheck: %d/%d keywords found", len(found_keywords), len(self.REQUIRED_KEYWORDS))
         
         return {
             'passed': passed,
@@ -256,43 +504,66 @@ class MedicalPolicyValidator:
             'total_found': len(found_keywords)
         }
     
-    def _classify_document(self, text: str) -> Dict[str, Any]:
+    def _classify_document(self, text: str, text_lower: str) -> Dict[str, Any]:
         """
         Stage 2: LLM-based document classification
-        Uses LLM to classify document type
+        Uses LLM to classify document type, reusing the answer for
+        near-duplicates of previously classified documents
         """
+        vec = _classification_cache.embed(text_lower)
+        if vec is not None:
+            cached_category = _classification_cache.lookup(vec)
+            if cached_category is not None:
+                logger.debug("Classification cache hit: %s", cached_category.value)
+                return {
+                    'category': cached_category,
+                    'raw_response': f"Cached classification: {cached_category.value}"
+                }
+        
+        if groq_client is None:
+            return self._fallback_classification(text_lower)
+        
         try:
-            # Import LLM client from your existing setup
-            from src.llm_groq import groq_client
-            
-            prompt = self.CLASSIFICATION_PROMPT.format(text=text)
-            
-            # Get LLM classification using your existing Groq client
-            completion = groq_client.chat.completions.create(
+            # Get LLM classification using your existing Groq client. The
+            # answer is one short category name, so stream it and hang up as
+            # soon as a known name has arrived instead of waiting for the end.
+            stream = groq_client.chat.completions.create(
                 model="llama-3.1-8b-instant",  # Use supported model
-                messages=[{"role": "user", "content": prompt}],
+                messages=[
+                    {"role": "system", "content": self.CLASSIFICATION_INSTRUCTIONS},
+                    {
+                        "role": "user",
+                        "content": self.CLASSIFICATION_USER_TEMPLATE.format(text=text),
+                    },
+                ],
                 max_tokens=10,
-                temperature=0.1
+                temperature=0.1,
+                stream=True
             )
             
-            classification = completion.choices[0].message.content
-            if classification:
-                classification = classification.strip()
-            else:
-                classification = "Others"
+            buffer = ""
+            try:
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        buffer += chunk.choices[0].delta.content
+                        if buffer.strip() in self.FINAL_CATEGORY_NAMES:
+                            break
+            finally:
+                stream.close()
             
-            # Map response to enum
-            category_mapping = {
-                "Medical Policy": DocumentCategory.MEDICAL_POLICY,
-                "Health Record": DocumentCategory.HEALTH_RECORD,
-                "Travel Ticket": DocumentCategory.TRAVEL_TICKET,
-                "Invoice": DocumentCategory.INVOICE,
-                "Others": DocumentCategory.OTHERS
-            }
+            answer = buffer.strip()
+            classification = answer or "Others"
             
-            category = category_mapping.get(classification, DocumentCategory.OTHERS)
+            # Map response to enum
+            category = self.CATEGORY_NAMES.get(answer)
+            recognised = category is not None
+            if not recognised:
+                category = DocumentCategory.OTHERS
             
-            logger.info(f"LLM classification result: {classification} -> {category.value}")
+            logger.debug("LLM classification result: %s -> %s", classification, category.value)
+            # Empty or unexpected answers are not reused for near-duplicates
+            if vec is not None and recognised:
+                _classification_cache.add(vec, category)
             
             return {
                 'category': category,
@@ -300,63 +571,36 @@ class MedicalPolicyValidator:
             }
             
         except Exception as e:
-            logger.warning(f"LLM classification failed, defaulting to OTHERS: {e}")
+            logger.warning("LLM classification failed, defaulting to OTHERS: %s", e)
             # Fallback: use keyword-based classification
-            return self._fallback_classification(text)
+            return self._fallback_classification(text_lower)
     
-    def _fallback_classification(self, text: str) -> Dict[str, Any]:
+    def _fallback_classification(self, text_lower: str) -> Dict[str, Any]:
         """
         Fallback classification when LLM is unavailable
-        Uses keyword patterns to classify documents
+        Uses keyword patterns on already-lowercased text to classify documents
         """
-        text_lower = text.lower()
-        
-        # Define classification patterns
-        classification_patterns = {
-            DocumentCategory.MEDICAL_POLICY: [
-                'insurance policy', 'policy number', 'sum insured', 'premium',
-                'cashless', 'co-payment', 'deductible', 'policy holder'
-            ],
-            DocumentCategory.HEALTH_RECORD: [
-                'patient', 'diagnosis', 'prescription', 'medical history',
-                'doctor', 'hospital admission', 'lab report'
-            ],
-            DocumentCategory.TRAVEL_TICKET: [
-                'flight', 'train', 'bus ticket', 'departure', 'arrival',
-                'passenger', 'seat number', 'boarding pass'
-            ],
-            DocumentCategory.INVOICE: [
-                'invoice', 'bill', 'receipt', 'amount due', 'payment',
-                'invoice number', 'tax', 'total amount'
-            ]
-        }
-        
         # Count matches for each category
-        scores = {}
-        for category, keywords in classification_patterns.items():
-            score = sum(1 for keyword in keywords if keyword in text_lower)
-            scores[category] = score
+        scores = {
+            category: sum(keyword in text_lower for keyword in keywords)
+            for category, keywords in self.CLASSIFICATION_KEYWORDS.items()
+        }
         
-        # Determine best match
+        # Determine best match (ties go to the earlier category)
+        best_category = max(scores, key=scores.get)
         if scores[DocumentCategory.MEDICAL_POLICY] >= 3:
             category = DocumentCategory.MEDICAL_POLICY
-        elif max(scores.values()) > 0:
-            # Find category with highest score
-            best_category = DocumentCategory.OTHERS
-            best_score = 0
-            for cat, score in scores.items():
-                if score > best_score:
-                    best_score = score
-                    best_category = cat
+        elif scores[best_category] > 0:
             category = best_category
         else:
             category = DocumentCategory.OTHERS
             
-        logger.info(f"Fallback classification result: {category.value} (scores: {scores})")
+        logger.debug("Fallback classification result: %s (scores: %s)", category.value, scores)
         
         return {
             'category': category,
-            'raw_response': f"Fallback classification: {category.value}"
+            'raw_response': f"Fallback classification: {category.value}",
+            'fallback': True
         }
     
     def _extract_fields(self, text: str) -> Dict[str, Any]:
@@ -365,24 +609,25 @@ class MedicalPolicyValidator:
         """
         extracted_fields = {}
         missing_fields = []
+        head = text[:self.FIELD_SEARCH_CHARS]
         
-        for field_name, patterns in self.MANDATORY_FIELDS.items():
+        for field_name, patterns in self._COMPILED_FIELDS.items():
             found = False
             
             for pattern in patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                if matches:
+                match = pattern.search(head)
+                if match:
                     # Take the first match and clean it up
-                    value = matches[0].strip()
+                    value = match.group(1).strip()
                     if value:
                         extracted_fields[field_name] = value
                         found = True
                         break
             
             if not found:
-                missing_fields.append(field_name.replace('_', ' ').title())
+                missing_fields.append(self._FIELD_LABELS[field_name])
         
-        logger.info(f"Field extraction: {len(extracted_fields)}/{len(self.MANDATORY_FIELDS)} fields found")
+        logger.debug("Field extraction: %d/%d fields found", len(extracted_fields), len(self.MANDATORY_FIELDS))
         
         return {
             'extracted_fields': extracted_fields,
@@ -394,14 +639,16 @@ class MedicalPolicyValidator:
         Stage 4: Calculate confidence score based on extracted data
         """
         # Field completeness score (60% weight)
-        field_score = (len(extracted_fields) / len(self.MANDATORY_FIELDS)) * 60.0
+        field_score = len(extracted_fields) * self._POINTS_PER_FIELD
         
         # Keyword presence score (40% weight)
-        keyword_score = min(len(found_keywords) / len(self.REQUIRED_KEYWORDS), 1.0) * 40.0
+        keyword_score = (
+            min(len(found_keywords), len(self.REQUIRED_KEYWORDS)) * self._POINTS_PER_KEYWORD
+        )
         
         total_score = field_score + keyword_score
         
-        logger.info(f"Confidence calculation: {field_score:.1f}% (fields) + {keyword_score:.1f}% (keywords) = {total_score:.1f}%")
+        logger.debug("Confidence calculation: %.1f%% (fields) + %.1f%% (keywords) = %.1f%%", field_score, keyword_score, total_score)
         
         return {
             'score': total_score,
@@ -417,7 +664,7 @@ class MedicalPolicyValidator:
         extracted_fields: Dict[str, str],
         error_message: str,
         user_message: str,
-        suggestions: List[str]
+        suggestions: Sequence[str]
     ) -> ValidationReport:
         """
         Helper method to create standardized error reports
@@ -2,32 +2,112 @@
 Performance monitoring system for ClaimWise backend.
 Provides request tracking, system metrics collection, and performance analytics.
 """
+import math
 import time
 import asyncio
 import logging
 import threading
-from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass, field
-from collections import defaultdict, deque
-from contextlib import asynccontextmanager
-import uuid
+from typing import Dict, List, Optional, Any, Callable, Tuple
+from dataclasses import dataclass
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+import itertools
+import secrets
+import sys
+from contextvars import ContextVar
 from datetime import datetime, timedelta
 
+import numpy as np
+
+try:
+    import psutil
+except ImportError:  # system metrics fall back to zeros
+    psutil = None
+
 logger = logging.getLogger(__name__)
 
-@dataclass
-class RequestMetrics:
-    endpoint: str
-    method: str
-    status_code: int
-    response_time: float
-    timestamp: datetime
-    user_id: Optional[str] = None
-    error: Optional[str] = None
-    request_size: int = 0
-    response_size: int = 0
+# Must be a power of two; endpoint keys are hashed onto these locks
+ENDPOINT_LOCK_STRIPES = 16
+# Endpoint stats columns are preallocated for this many "METHOD /route" keys;
+# keys seen once the table is full are counted under OVERFLOW_ENDPOINT_KEY
+MAX_ENDPOINTS = 256
+OVERFLOW_ENDPOINT_KEY = "OTHER"
+
+# Finished requests are buffered per thread and folded into the shared stats
+# in batches; a thread flushes inline once its buffer reaches this many
+METRICS_BUFFER_MAX_RECORDS = 1024
+
+# One row of the recent-request ring (32 bytes, vs ~300 for a dataclass)
+REQUEST_RECORD_DTYPE = np.dtype([
+    ("endpoint_id", np.int32),
+    ("status_code", np.int16),
+    ("timestamp_ns", np.int64),
+    ("duration_ns", np.int64),
+    ("request_size", np.int32),
+    ("response_size", np.int32),
+], align=True)
+_INT32_MAX = np.iinfo(np.int32).max
+
+# Durations are perf_counter_ns() differences, kept as integers until output
+NS_PER_SECOND = 1_000_000_000
+NS_PER_MINUTE = 60 * NS_PER_SECOND
+_INT64_MAX = np.iinfo(np.int64).max
+
+# The performance summary covers this many one-minute slots
+SUMMARY_WINDOW_MINUTES = 60
+SUMMARY_CACHE_TTL_SECONDS = 1.0
+# Response-time histogram: log-spaced buckets from 1 ms to 60 s (~19% wide)
+LATENCY_BUCKETS = 64
+LATENCY_MIN_SECONDS = 1e-3
+LATENCY_MAX_SECONDS = 60.0
+LATENCY_BUCKET_EDGES = np.geomspace(
+    LATENCY_MIN_SECONDS, LATENCY_MAX_SECONDS, LATENCY_BUCKETS + 1
+)
+_LATENCY_BUCKET_SCALE = LATENCY_BUCKETS / math.log(
+    LATENCY_MAX_SECONDS / LATENCY_MIN_SECONDS
+)
+
+
+_LATENCY_MIN_NS = int(LATENCY_MIN_SECONDS * NS_PER_SECOND)
+
+
+def latency_bucket(duration_ns: int) -> int:
+    """Histogram bucket index for a response time in nanoseconds"""
+    if duration_ns <= _LATENCY_MIN_NS:
+        return 0
+    index = int(math.log(duration_ns / _LATENCY_MIN_NS) * _LATENCY_BUCKET_SCALE)
+    return min(index, LATENCY_BUCKETS - 1)
+
+
+def histogram_percentile(counts: np.ndarray, fraction: float) -> np.ndarray:
+    """Upper edge of the bucket holding the ``fraction`` quantile of ``counts``.
+    
+    ``counts`` is one histogram or a stack of them, one per row; empty
+    histograms give 0.
+    """
+    cumulative = np.cumsum(counts, axis=-1)
+    totals = cumulative[..., -1]
+    ranks = (totals * fraction).astype(np.int64)
+    index = np.argmax(cumulative > ranks[..., None], axis=-1)
+    return np.where(totals > 0, LATENCY_BUCKET_EDGES[index + 1], 0.0)
+
+# Request ids are a per-process counter; the random prefix keeps trace ids
+# from different workers or restarts apart in shared logs
+TRACE_ID_PREFIX = secrets.token_hex(3)
+# Request id of the request being served by the current task/thread, "-" outside one
+trace_id_var: ContextVar[str] = ContextVar("trace_id", default="-")
+# Per-request bookkeeping (perf_counter_ns start, client ip) set by PerformanceMiddleware
+request_ctx_var: ContextVar[Dict[str, Any]] = ContextVar("request_ctx")
+
+
+class TraceIdFilter(logging.Filter):
+    """Stamp ``record.trace_id`` from the current request context."""
 
-@dataclass
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trace_id = trace_id_var.get()
+        return True
+
+@dataclass(slots=True)
 class SystemMetrics:
     timestamp: datetime
     cpu_percent: float = 0.0
@@ -36,43 +116,107 @@ class SystemMetrics:
     active_requests: int = 0
     total_requests: int = 0
     error_rate: float = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict view; datetimes are left for orjson to encode"""
+        return {
+            "timestamp": self.timestamp,
+            "cpu_percent": self.cpu_percent,
+            "memory_percent": self.memory_percent,
+            "disk_percent": self.disk_percent,
+            "active_requests": self.active_requests,
+            "error_rate": self.error_rate
+        }
 
-@dataclass
-class EndpointStats:
-    total_requests: int = 0
-    total_response_time: float = 0.0
-    min_response_time: float = float('inf')
-    max_response_time: float = 0.0
-    error_count: int = 0
-    last_request: Optional[datetime] = None
-    recent_response_times: deque = field(default_factory=lambda: deque(maxlen=100))
+class RingBuffer:
+    """Fixed-capacity ring of numpy records that reports what it overwrites.
+    
+    Capacity is rounded up to a power of two so the write position is a
+    mask rather than a modulo. Rows live in one contiguous array; ``append``
+    hands back the evicted row so callers can keep running aggregates over
+    exactly the rows retained.
+    """
     
-    @property
-    def avg_response_time(self) -> float:
-        return self.total_response_time / max(1, self.total_requests)
+    def __init__(self, capacity: int, dtype: np.dtype):
+        self.capacity = 1 << max(capacity - 1, 0).bit_length()
+        self._mask = self.capacity - 1
+        self.buffer = np.zeros(self.capacity, dtype=dtype)
+        self._appended = 0
     
-    @property
-    def error_rate(self) -> float:
-        return (self.error_count / max(1, self.total_requests)) * 100
+    def __len__(self) -> int:
+        return min(self._appended, self.capacity)
     
-    @property
-    def p95_response_time(self) -> float:
-        if not self.recent_response_times:
-            return 0.0
-        sorted_times = sorted(self.recent_response_times)
-        index = int(len(sorted_times) * 0.95)
-        return sorted_times[index] if index < len(sorted_times) else sorted_times[-1]
+    def append(self, row: tuple) -> Optional[np.void]:
+        """Store ``row``, returning a copy of the row it replaced, if any"""
+        index = self._appended & self._mask
+        evicted = self.buffer[index].copy() if self._appended >= self.capacity else None
+        self.buffer[index] = row
+        self._appended += 1
+        return evicted
+    
+    def clear(self) -> None:
+        self._appended = 0
+
+class _MinuteSlot:
+    """Running request aggregates for one minute of the summary window"""
+
+    __slots__ = ("minute", "count", "total_ns", "errors", "slow", "latency", "endpoints")
+
+    def __init__(self):
+        self.latency = np.zeros(LATENCY_BUCKETS, dtype=np.int64)
+        self.endpoints = np.zeros(MAX_ENDPOINTS, dtype=np.int64)
+        self.reset(-1)
+
+    def reset(self, minute: int) -> None:
+        self.minute = minute
+        self.count = 0
+        self.total_ns = 0
+        self.errors = 0
+        self.slow = 0
+        self.latency.fill(0)
+        self.endpoints.fill(0)
 
 class PerformanceMonitor:
     """Central performance monitoring system"""
     
     def __init__(self, max_metrics_history: int = 1000):
         self.max_metrics_history = max_metrics_history
-        self.request_metrics: deque = deque(maxlen=max_metrics_history)
+        # Recent requests as a ring of packed rows that numpy can scan
+        # column-wise without touching Python objects, plus the number of
+        # error responses among the rows it currently holds
+        self._requests = RingBuffer(max_metrics_history, REQUEST_RECORD_DTYPE)
+        self._ring_errors = 0
         self.system_metrics: deque = deque(maxlen=max_metrics_history)
-        self.endpoint_stats: Dict[str, EndpointStats] = defaultdict(EndpointStats)
-        self.active_requests: Dict[str, float] = {}  # request_id -> start_time
+        # Per-endpoint stats as columns indexed by an interned endpoint id
+        self._endpoint_ids: Dict[str, int] = {OVERFLOW_ENDPOINT_KEY: 0}
+        self._route_ids: Dict[Tuple[str, str], int] = {}
+        self._endpoint_keys: List[str] = [OVERFLOW_ENDPOINT_KEY]
+        self._endpoint_ids_lock = threading.Lock()
+        self._ep_count = np.zeros(MAX_ENDPOINTS, dtype=np.int64)
+        self._ep_total_ns = np.zeros(MAX_ENDPOINTS, dtype=np.int64)
+        self._ep_min_ns = np.full(MAX_ENDPOINTS, _INT64_MAX, dtype=np.int64)
+        self._ep_max_ns = np.zeros(MAX_ENDPOINTS, dtype=np.int64)
+        self._ep_errors = np.zeros(MAX_ENDPOINTS, dtype=np.int64)
+        self._ep_last_request = np.zeros(MAX_ENDPOINTS, dtype=np.int64)  # epoch ns
+        self._ep_latency = np.zeros((MAX_ENDPOINTS, LATENCY_BUCKETS), dtype=np.int64)
+        # In-flight request count. Written under its own small lock so
+        # start_request never waits on ring writers or summary readers; a
+        # plain int read is atomic, so readers take no lock at all.
+        self.active_requests = 0
+        self._active_lock = threading.Lock()
+        # Ring of per-minute aggregates backing get_performance_summary
+        self._window = [_MinuteSlot() for _ in range(SUMMARY_WINDOW_MINUTES)]
+        # (perf_counter_ns when built, summary) of the last get_performance_summary
+        self._summary_cache: Tuple[float, Dict[str, Any]] = (-math.inf, {})
+        # Guards the metric rings and the summary window
         self.lock = threading.RLock()
+        # Endpoint stats are striped so unrelated endpoints never contend
+        self._stripes = [threading.RLock() for _ in range(ENDPOINT_LOCK_STRIPES)]
+        self._next_request_id = itertools.count(1).__next__
+        # Per-thread lists of finished-request records awaiting flush()
+        self._local = threading.local()
+        self._buffers: List[list] = []
+        self._buffers_lock = threading.Lock()
         
         # Performance thresholds
         self.slow_request_threshold = 5.0  # seconds
@@ -80,87 +224,220 @@ class PerformanceMonitor:
         
         # Initialize psutil CPU monitoring for non-blocking measurements
         self.psutil_available = False
+        if psutil is None:
+            logger.debug("psutil not available, system metrics will use defaults")
+            return
         try:
-            import psutil
             # Seed CPU measurement - first call may return 0.0
             psutil.cpu_percent(interval=None)
             self.psutil_available = True
             logger.debug("psutil initialized for non-blocking CPU measurements")
-        except ImportError:
-            logger.debug("psutil not available, system metrics will use defaults")
         except Exception as e:
-            logger.debug(f"Error initializing psutil: {e}")
+            logger.debug("Error initializing psutil: %s", e)
+    
+    def _endpoint_id(self, method: str, endpoint: str) -> int:
+        """Intern ``(method, endpoint)`` as a row index into the endpoint columns"""
+        endpoint_id = self._route_ids.get((method, endpoint))
+        if endpoint_id is not None:
+            return endpoint_id
+        if len(self._endpoint_keys) >= MAX_ENDPOINTS:
+            return 0
+        with self._endpoint_ids_lock:
+            endpoint_id = self._route_ids.get((method, endpoint))
+            if endpoint_id is None:
+                if len(self._endpoint_keys) >= MAX_ENDPOINTS:
+                    return 0
+                # The "METHOD /route" label is built and interned once per route
+                endpoint_key = sys.intern(f"{method} {endpoint}")
+                endpoint_id = self._endpoint_ids.setdefault(
+                    endpoint_key, len(self._endpoint_keys)
+                )
+                if endpoint_id == len(self._endpoint_keys):
+                    self._endpoint_keys.append(endpoint_key)
+                self._route_ids[(method, endpoint)] = endpoint_id
+            return endpoint_id
+    
+    def _endpoint_lock(self, endpoint_id: int) -> threading.RLock:
+        """Stripe lock guarding row ``endpoint_id`` of the endpoint columns"""
+        return self._stripes[endpoint_id & (ENDPOINT_LOCK_STRIPES - 1)]
     
+    @contextmanager
+    def _all_endpoint_locks(self):
+        """Hold every stripe, for consistent whole-table reads and resets"""
+        for stripe in self._stripes:
+            stripe.acquire()
+        try:
+            yield
+        finally:
+            for stripe in self._stripes:
+                stripe.release()
     
-    def start_request(self, endpoint: str, method: str, user_id: Optional[str] = None) -> str:
+    def start_request(self, endpoint: str, method: str, user_id: Optional[str] = None) -> int:
         """Start tracking a new request"""
-        request_id = str(uuid.uuid4())[:8]
+        request_id = self._next_request_id()
         
-        with self.lock:
-            self.active_requests[request_id] = time.time()
+        with self._active_lock:
+            self.active_requests += 1
         
-        logger.debug(f"Started tracking request {request_id}: {method} {endpoint}")
+        logger.debug("Started tracking request %s: %s %s", request_id, method, endpoint)
         return request_id
     
     def end_request(
         self,
-        request_id: str,
+        request_id: int,
         endpoint: str,
         method: str,
         status_code: int,
         user_id: Optional[str] = None,
         error: Optional[str] = None,
         request_size: int = 0,
-        response_size: int = 0
+        response_size: int = 0,
+        start_ns: Optional[int] = None
     ):
-        """End tracking a request and record metrics"""
+        """End tracking a request and record metrics.
+
+        ``start_ns`` is a ``time.perf_counter_ns()`` reading; it defaults to
+        the one stored in ``request_ctx_var`` for the current request.
+        """
+        finished_ns = time.perf_counter_ns()
+        if start_ns is None:
+            ctx = request_ctx_var.get(None)
+            start_ns = ctx["start"] if ctx else finished_ns
+        duration_ns = finished_ns - start_ns
+        is_error = status_code >= 400 or bool(error)
+        endpoint_id = self._endpoint_id(method, endpoint)
         
-        with self.lock:
-            start_time = self.active_requests.pop(request_id, time.time())
-            response_time = time.time() - start_time
-            
-            # Create metrics record
-            metrics = RequestMetrics(
-                endpoint=endpoint,
-                method=method,
-                status_code=status_code,
-                response_time=response_time,
-                timestamp=datetime.now(),
-                user_id=user_id,
-                error=error,
-                request_size=request_size,
-                response_size=response_size
+        with self._active_lock:
+            self.active_requests = max(0, self.active_requests - 1)
+        
+        # Shared stats are updated off the request path by flush()
+        buffer = self._thread_buffer()
+        buffer.append((
+            endpoint_id, status_code, is_error, duration_ns, finished_ns,
+            request_size, response_size
+        ))
+        if len(buffer) >= METRICS_BUFFER_MAX_RECORDS:
+            self.flush()
+        
+        # Log slow requests
+        if duration_ns > self.slow_request_threshold * NS_PER_SECOND:
+            response_time = duration_ns / NS_PER_SECOND
+            logger.warning(
+                "Slow request detected: %s took %.2fs", endpoint, response_time,
+                extra={
+                    "request_id": request_id,
+                    "endpoint": endpoint,
+                    "response_time": response_time,
+                    "status_code": status_code
+                }
             )
+        
+        logger.debug("Completed tracking request %s: %.3fs", request_id, duration_ns / NS_PER_SECOND)
+    
+    def _thread_buffer(self) -> list:
+        """This thread's pending request records, registered on first use"""
+        try:
+            return self._local.buffer
+        except AttributeError:
+            buffer = self._local.buffer = []
+            with self._buffers_lock:
+                self._buffers.append(buffer)
+            return buffer
+    
+    def flush(self) -> None:
+        """Fold every thread's buffered request records into the shared stats.
+        
+        Producers only ever append to their own list. Taking the first
+        ``len`` records and deleting that prefix is safe against concurrent
+        appends, which land after it, so producers need no lock.
+        """
+        with self.lock:
+            batch = []
+            for buffer in list(self._buffers):
+                count = len(buffer)
+                if count:
+                    batch.extend(buffer[:count])
+                    del buffer[:count]
+            if not batch:
+                return
+            endpoint_columns = self._record_batch(batch)
+        # Endpoint stats only need their own stripes, not the ring lock
+        self._record_endpoint_batch(*endpoint_columns)
+    
+    def _record_batch(self, batch: List[tuple]) -> Tuple[np.ndarray, ...]:
+        """Apply buffered records to the ring and summary window.
+        
+        Called with ``self.lock`` held. Returns the batch's endpoint id,
+        duration, error, timestamp and latency bucket columns for
+        ``_record_endpoint_batch``.
+        """
+        requests = self._requests
+        window = self._window
+        slow_threshold_ns = self.slow_request_threshold * NS_PER_SECOND
+        
+        # Records carry only perf_counter_ns readings; the wall clock is
+        # sampled once per batch and applied as an offset
+        wall_offset_ns = time.time_ns() - time.perf_counter_ns()
+        timestamps = []
+        buckets = []
+        
+        for (endpoint_id, status_code, is_error, duration_ns, finished_ns,
+             request_size, response_size) in batch:
+            timestamp_ns = finished_ns + wall_offset_ns
+            minute = finished_ns // NS_PER_MINUTE
+            evicted = requests.append((
+                endpoint_id, status_code, timestamp_ns, duration_ns,
+                # Content-Length is client supplied; clamp to the column
+                min(request_size, _INT32_MAX), min(response_size, _INT32_MAX)
+            ))
+            self._ring_errors += status_code >= 400
+            if evicted is not None and evicted["status_code"] >= 400:
+                self._ring_errors -= 1
             
-            self.request_metrics.append(metrics)
-            
-            # Update endpoint stats
-            endpoint_key = f"{method} {endpoint}"
-            stats = self.endpoint_stats[endpoint_key]
-            
-            stats.total_requests += 1
-            stats.total_response_time += response_time
-            stats.min_response_time = min(stats.min_response_time, response_time)
-            stats.max_response_time = max(stats.max_response_time, response_time)
-            stats.last_request = metrics.timestamp
-            stats.recent_response_times.append(response_time)
-            
-            if status_code >= 400 or error:
-                stats.error_count += 1
-            
-            # Log slow requests
-            if response_time > self.slow_request_threshold:
-                logger.warning(
-                    f"Slow request detected: {endpoint} took {response_time:.2f}s",
-                    extra={
-                        "request_id": request_id,
-                        "endpoint": endpoint,
-                        "response_time": response_time,
-                        "status_code": status_code
-                    }
-                )
+            slot = window[minute % SUMMARY_WINDOW_MINUTES]
+            if slot.minute != minute:
+                slot.reset(minute)
+            slot.count += 1
+            slot.total_ns += duration_ns
+            slot.errors += is_error
+            slot.slow += duration_ns > slow_threshold_ns
+            bucket = latency_bucket(duration_ns)
+            slot.latency[bucket] += 1
+            slot.endpoints[endpoint_id] += 1
+            timestamps.append(timestamp_ns)
+            buckets.append(bucket)
         
-        logger.debug(f"Completed tracking request {request_id}: {response_time:.3f}s")
+        size = len(batch)
+        return (
+            np.fromiter((record[0] for record in batch), np.int64, size),
+            np.fromiter((record[3] for record in batch), np.int64, size),
+            np.fromiter((record[2] for record in batch), np.int64, size),
+            np.array(timestamps, dtype=np.int64),
+            np.array(buckets, dtype=np.int64),
+        )
+    
+    def _record_endpoint_batch(
+        self,
+        endpoint_ids: np.ndarray,
+        durations: np.ndarray,
+        errors: np.ndarray,
+        timestamps: np.ndarray,
+        buckets: np.ndarray,
+    ) -> None:
+        """Fold a batch into the endpoint columns, one touched stripe at a time"""
+        stripes = endpoint_ids & (ENDPOINT_LOCK_STRIPES - 1)
+        for stripe in np.unique(stripes):
+            rows = stripes == stripe
+            ids = endpoint_ids[rows]
+            row_durations = durations[rows]
+            with self._stripes[stripe]:
+                np.add.at(self._ep_count, ids, 1)
+                np.add.at(self._ep_total_ns, ids, row_durations)
+                np.minimum.at(self._ep_min_ns, ids, row_durations)
+                np.maximum.at(self._ep_max_ns, ids, row_durations)
+                np.add.at(self._ep_errors, ids, errors[rows])
+                np.maximum.at(self._ep_last_request, ids, timestamps[rows])
+                np.add.at(self._ep_latency, (ids, buckets[rows]), 1)
     
     def record_system_metric(self):
         """Record current system metrics"""
@@ -172,165 +449,219 @@ class PerformanceMonitor:
             
             if self.psutil_available:
                 try:
-                    import psutil
-                    # Use non-blocking CPU measurement
+                    # Non-blocking: CPU use since the previous sample
                     cpu_percent = psutil.cpu_percent(interval=None)
                     memory = psutil.virtual_memory()
                     memory_percent = memory.percent
                     disk = psutil.disk_usage('/')
                     disk_percent = disk.percent
                 except Exception as e:
-                    logger.debug(f"Error getting system metrics: {e}")
+                    logger.debug("Error getting system metrics: %s", e)
             else:
                 logger.debug("psutil not available, using default system metrics")
             
+            active_count = self.active_requests
+            self.flush()
+            with self.lock:
+                total_count = len(self._requests)
+                ring_errors = self._ring_errors
+            
+            # Error rate over the retained requests, kept up to date
+            # as rows enter and leave the ring
+            error_rate = (ring_errors / max(1, total_count)) * 100
+            
+            metrics = SystemMetrics(
+                timestamp=datetime.now(),
+                cpu_percent=cpu_percent,
+                memory_percent=memory_percent,
+                disk_percent=disk_percent,
+                active_requests=active_count,
+                total_requests=total_count,
+                error_rate=error_rate
+            )
+            
             with self.lock:
-                active_count = len(self.active_requests)
-                total_count = len(self.request_metrics)
-                
-                # Calculate recent error rate
-                recent_metrics = [m for m in list(self.request_metrics)[-100:]]
-                error_count = sum(1 for m in recent_metrics if m.status_code >= 400 or m.error)
-                error_rate = (error_count / max(1, len(recent_metrics))) * 100
-                
-                metrics = SystemMetrics(
-                    timestamp=datetime.now(),
-                    cpu_percent=cpu_percent,
-                    memory_percent=memory_percent,
-                    disk_percent=disk_percent,
-                    active_requests=active_count,
-                    total_requests=total_count,
-                    error_rate=error_rate
-                )
-                
                 self.system_metrics.append(metrics)
         
         except Exception as e:
-            logger.error(f"Error recording system metrics: {e}")
+            logger.error("Error recording system metrics: %s", e)
     
     def get_performance_summary(self) -> Dict[str, Any]:
-        """Get comprehensive performance summary"""
+        """Get comprehensive performance summary
+        
+        Built from the per-minute aggregates, so the cost does not depend
+        on how many requests were served in the last hour. Dashboards and
+        health checks poll this, so a result is reused for
+        ``SUMMARY_CACHE_TTL_SECONDS``.
+        """
+        now_ns = time.perf_counter_ns()
+        cached_at, cached_summary = self._summary_cache
+        if now_ns - cached_at < SUMMARY_CACHE_TTL_SECONDS * NS_PER_SECOND:
+            return cached_summary
+        summary = self._build_performance_summary(now_ns)
+        self._summary_cache = (now_ns, summary)
+        return summary
+    
+    def _build_performance_summary(self, now_ns: int) -> Dict[str, Any]:
+        oldest_minute = now_ns // NS_PER_MINUTE - SUMMARY_WINDOW_MINUTES
+        total_requests = 0
+        total_ns = 0
+        error_count = 0
+        slow_requests = 0
+        latency = np.zeros(LATENCY_BUCKETS, dtype=np.int64)
+        endpoint_counts = np.zeros(MAX_ENDPOINTS, dtype=np.int64)
+        
+        active_requests = self.active_requests
+        self.flush()
         with self.lock:
-            now = datetime.now()
-            hour_ago = now - timedelta(hours=1)
-            
-            # Recent metrics (last hour)
-            recent_requests = [
-                m for m in self.request_metrics
-                if m.timestamp >= hour_ago
-            ]
-            
-            # Calculate summary stats
-            total_requests = len(recent_requests)
-            if total_requests == 0:
-                return {
-                    "period": "last_hour",
-                    "total_requests": 0,
-                    "avg_response_time": 0,
-                    "error_rate": 0,
-                    "active_requests": len(self.active_requests),
-                    "top_endpoints": []
-                }
-            
-            total_response_time = sum(m.response_time for m in recent_requests)
-            avg_response_time = total_response_time / total_requests
-            
-            error_count = sum(1 for m in recent_requests if m.status_code >= 400 or m.error)
-            error_rate = (error_count / total_requests) * 100
-            
-            # Top endpoints by request count
-            endpoint_counts = defaultdict(int)
-            for m in recent_requests:
-                endpoint_counts[f"{m.method} {m.endpoint}"] += 1
-            
-            top_endpoints = sorted(
-                endpoint_counts.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:5]
-            
-            # Response time percentiles
-            response_times = sorted(m.response_time for m in recent_requests)
-            p50 = response_times[len(response_times) // 2] if response_times else 0
-            p95 = response_times[int(len(response_times) * 0.95)] if response_times else 0
-            p99 = response_times[int(len(response_times) * 0.99)] if response_times else 0
-            
+            for slot in self._window:
+                if slot.minute <= oldest_minute or not slot.count:
+                    continue
+                total_requests += slot.count
+                total_ns += slot.total_ns
+                error_count += slot.errors
+                slow_requests += slot.slow
+                latency += slot.latency
+                endpoint_counts += slot.endpoints
+        
+        if total_requests == 0:
             return {
                 "period": "last_hour",
-                "total_requests": total_requests,
-                "avg_response_time": round(avg_response_time, 3),
-                "p50_response_time": round(p50, 3),
-                "p95_response_time": round(p95, 3),
-                "p99_response_time": round(p99, 3),
-                "error_rate": round(error_rate, 2),
-                "error_count": error_count,
-                "active_requests": len(self.active_requests),
-                "top_endpoints": [
-                    {"endpoint": endpoint, "requests": count}
-                    for endpoint, count in top_endpoints
-                ],
-                "slow_requests": len([m for m in recent_requests if m.response_time > self.slow_request_threshold])
+                "total_requests": 0,
+                "avg_response_time": 0,
+                "p50_response_time": 0,
+                "p95_response_time": 0,
+                "p99_response_time": 0,
+                "error_rate": 0,
+                "error_count": 0,
+                "active_requests": active_requests,
+                "top_endpoints": [],
+                "slow_requests": 0
             }
+        
+        avg_response_time = total_ns / total_requests / NS_PER_SECOND
+        error_rate = (error_count / total_requests) * 100
+        
+        # Top endpoints by request count
+        top_ids = np.argsort(-endpoint_counts, kind="stable")[:5]
+        top_endpoints = [
+            (self._endpoint_keys[i], int(endpoint_counts[i]))
+            for i in top_ids
+            if endpoint_counts[i]
+        ]
+        
+        # Response time percentiles (bucket upper bounds)
+        p50, p95, p99 = (
+            float(histogram_percentile(latency, fraction))
+            for fraction in (0.5, 0.95, 0.99)
+        )
+        
+        return {
+            "period": "last_hour",
+            "total_requests": total_requests,
+            "avg_response_time": round(avg_response_time, 3),
+            "p50_response_time": round(p50, 3),
+            "p95_response_time": round(p95, 3),
+            "p99_response_time": round(p99, 3),
+            "error_rate": round(error_rate, 2),
+            "error_count": error_count,
+            "active_requests": active_requests,
+            "top_endpoints": [
+                {"endpoint": endpoint, "requests": count}
+                for endpoint, count in top_endpoints
+            ],
+            "slow_requests": slow_requests
+        }
     
     def get_endpoint_stats(self, endpoint: Optional[str] = None) -> Dict[str, Any]:
         """Get statistics for specific endpoint or all endpoints"""
-        with self.lock:
-            if endpoint:
-                stats = self.endpoint_stats.get(endpoint)
-                if not stats:
-                    return {}
-                
-                return {
-                    "endpoint": endpoint,
-                    "total_requests": stats.total_requests,
-                    "avg_response_time": round(stats.avg_response_time, 3),
-                    "min_response_time": round(stats.min_response_time, 3),
-                    "max_response_time": round(stats.max_response_time, 3),
-                    "p95_response_time": round(stats.p95_response_time, 3),
-                    "error_rate": round(stats.error_rate, 2),
-                    "error_count": stats.error_count,
-                    "last_request": stats.last_request.isoformat() if stats.last_request else None
-                }
-            else:
-                # Return all endpoint stats
-                return {
-                    endpoint: {
-                        "total_requests": stats.total_requests,
-                        "avg_response_time": round(stats.avg_response_time, 3),
-                        "error_rate": round(stats.error_rate, 2),
-                        "p95_response_time": round(stats.p95_response_time, 3)
-                    }
-                    for endpoint, stats in self.endpoint_stats.items()
-                    if stats.total_requests > 0
-                }
+        self.flush()
+        if endpoint:
+            endpoint_id = self._endpoint_ids.get(endpoint)
+            if endpoint_id is None:
+                return {}
+            
+            # Copy the raw row under the stripe; derive and format after
+            with self._endpoint_lock(endpoint_id):
+                count = int(self._ep_count[endpoint_id])
+                total_ns = int(self._ep_total_ns[endpoint_id])
+                min_ns = int(self._ep_min_ns[endpoint_id])
+                max_ns = int(self._ep_max_ns[endpoint_id])
+                errors = int(self._ep_errors[endpoint_id])
+                last_ns = int(self._ep_last_request[endpoint_id])
+                latency = self._ep_latency[endpoint_id].copy()
+            
+            if not count:
+                return {}
+            return {
+                "endpoint": endpoint,
+                "total_requests": count,
+                "avg_response_time": round(total_ns / count / NS_PER_SECOND, 3),
+                "min_response_time": round(min_ns / NS_PER_SECOND, 3),
+                "max_response_time": round(max_ns / NS_PER_SECOND, 3),
+                "p95_response_time": round(float(histogram_percentile(latency, 0.95)), 3),
+                "error_rate": round(errors / count * 100, 2),
+                "error_count": errors,
+                "last_request": datetime.fromtimestamp(last_ns / 1e9) if last_ns else None
+            }
+        
+        # Return all endpoint stats, busiest first
+        with self._all_endpoint_locks():
+            n = len(self._endpoint_keys)
+            counts = self._ep_count[:n].copy()
+            total_ns = self._ep_total_ns[:n].copy()
+            errors = self._ep_errors[:n].copy()
+            latency = self._ep_latency[:n].copy()
+        
+        p95s = np.round(histogram_percentile(latency, 0.95), 3)
+        safe_counts = np.maximum(counts, 1)
+        avg_times = np.round(total_ns / safe_counts / NS_PER_SECOND, 3)
+        error_rates = np.round(errors / safe_counts * 100, 2)
+        return {
+            self._endpoint_keys[i]: {
+                "total_requests": int(counts[i]),
+                "avg_response_time": float(avg_times[i]),
+                "error_rate": float(error_rates[i]),
+                "p95_response_time": float(p95s[i])
+            }
+            for i in np.argsort(-counts, kind="stable")
+            if counts[i] > 0
+        }
     
     def get_system_metrics(self, hours: int = 1) -> List[Dict[str, Any]]:
         """Get system metrics for the specified time period"""
+        cutoff_time = datetime.now() - timedelta(hours=hours)
         with self.lock:
-            cutoff_time = datetime.now() - timedelta(hours=hours)
-            recent_metrics = [
-                {
-                    "timestamp": m.timestamp.isoformat(),
-                    "cpu_percent": m.cpu_percent,
-                    "memory_percent": m.memory_percent,
-                    "disk_percent": m.disk_percent,
-                    "active_requests": m.active_requests,
-                    "error_rate": m.error_rate
-                }
-                for m in self.system_metrics
-                if m.timestamp >= cutoff_time
-            ]
-            
-            return recent_metrics
+            # Samples are appended in time order: walk back from the newest
+            # and stop at the cutoff instead of scanning the whole history
+            recent = list(itertools.takewhile(
+                lambda m: m.timestamp >= cutoff_time, reversed(self.system_metrics)
+            ))
+        
+        return [m.to_dict() for m in reversed(recent)]
     
     def reset_stats(self):
         """Reset all statistics"""
         with self.lock:
-            self.request_metrics.clear()
+            for buffer in list(self._buffers):
+                del buffer[:]
+            self._requests.clear()
+            self._ring_errors = 0
             self.system_metrics.clear()
-            self.endpoint_stats.clear()
-            self.active_requests.clear()
-            logger.info("Performance statistics reset")
+            for slot in self._window:
+                slot.reset(-1)
+            self._summary_cache = (-math.inf, {})
+        with self._active_lock:
+            self.active_requests = 0
+        with self._all_endpoint_locks():
+            self._ep_count.fill(0)
+            self._ep_total_ns.fill(0)
+            self._ep_min_ns.fill(_INT64_MAX)
+            self._ep_max_ns.fill(0)
+            self._ep_errors.fill(0)
+            self._ep_last_request.fill(0)
+            self._ep_latency.fill(0)
+        logger.info("Performance statistics reset")
 
 # Global monitor instance
 monitor = PerformanceMonitor()
@@ -339,75 +670,174 @@ monitor = PerformanceMonitor()
 async def track_request(endpoint: str, method: str, user_id: Optional[str] = None):
     """Async context manager for tracking requests"""
     request_id = monitor.start_request(endpoint, method, user_id)
+    start_ns = time.perf_counter_ns()
     
     try:
         yield request_id
-        monitor.end_request(request_id, endpoint, method, 200, user_id)
+        monitor.end_request(request_id, endpoint, method, 200, user_id, start_ns=start_ns)
     except Exception as e:
-        monitor.end_request(request_id, endpoint, method, 500, user_id, str(e))
+        monitor.end_request(
+            request_id, endpoint, method, 500, user_id, str(e), start_ns=start_ns
+        )
         raise
 
-def performance_middleware():
-    """Middleware for automatic request tracking"""
-    async def middleware(request, call_next):
-        endpoint = request.url.path
-        method = request.method
-        
-        # Get user ID if available
-        user_id = getattr(request.state, 'user_id', None)
-        
+def _route_path(scope, default: str) -> str:
+    """Route template the router matched (``/policies/{policy_id}``), if any.
+
+    Keeps endpoint stats keyed per route rather than per concrete URL.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or default
+
+class PerformanceMiddleware:
+    """Pure ASGI request tracking.
+
+    Avoids the extra task group and streaming body proxy that
+    ``app.middleware("http")`` adds to every request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = scope["path"]
+        method = scope["method"]
+        user_id = scope.get("state", {}).get("user_id")
         request_id = monitor.start_request(endpoint, method, user_id)
-        start_time = time.time()
-        
+        trace_id = f"{TRACE_ID_PREFIX}-{request_id:x}"
+        trace_token = trace_id_var.set(trace_id)
+        start_ns = time.perf_counter_ns()
+        client = scope.get("client")
+        ctx_token = request_ctx_var.set(
+            {"start": start_ns, "ip": client[0] if client else None}
+        )
+
+        request_size = 0
+        for name, value in scope.get("headers", ()):
+            if name == b"content-length":
+                request_size = int(value) if value.isdigit() else 0
+                break
+
+        status_code = 500
+        response_size = 0
+        # Bodies are only measured chunk by chunk when no Content-Length is
+        # sent (streaming responses); they are never buffered here
+        count_body = True
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_size, count_body
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_time = (time.perf_counter_ns() - start_ns) / NS_PER_SECOND
+                headers = list(message.get("headers", []))
+                for name, value in headers:
+                    if name == b"content-length":
+                        if value.isdigit():
+                            response_size = int(value)
+                            count_body = False
+                        break
+                headers.append((b"x-response-time", f"{response_time:.3f}s".encode()))
+                headers.append((b"x-request-id", trace_id.encode()))
+                message = {**message, "headers": headers}
+            elif count_body and message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
         try:
-            response = await call_next(request)
-            
-            # Calculate sizes
-            request_size = int(request.headers.get('content-length', 0))
-            response_size = len(response.body) if hasattr(response, 'body') else 0
-            
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            endpoint = _route_path(scope, endpoint)
             monitor.end_request(
-                request_id, endpoint, method, response.status_code,
-                user_id, None, request_size, response_size
+                request_id, endpoint, method, 500, user_id, str(e), start_ns=start_ns
             )
-            
-            # Add performance headers
-            response_time = time.time() - start_time
-            response.headers["X-Response-Time"] = f"{response_time:.3f}s"
-            response.headers["X-Request-ID"] = request_id
-            
-            return response
-            
-        except Exception as e:
-            monitor.end_request(request_id, endpoint, method, 500, user_id, str(e))
             raise
-    
-    return middleware
+        finally:
+            request_ctx_var.reset(ctx_token)
+            trace_id_var.reset(trace_token)
+
+        endpoint = _route_path(scope, endpoint)
+        monitor.end_request(
+            request_id, endpoint, method, status_code,
+            user_id, None, request_size, response_size, start_ns
+        )
 
 # Background metrics collection
+SYSTEM_METRICS_INTERVAL_SECONDS = 60
+METRICS_FLUSH_INTERVAL_SECONDS = 0.1
+
+_metrics_task: Optional[asyncio.Task] = None
+_flush_task: Optional[asyncio.Task] = None
+
+
 async def collect_system_metrics():
     """Background task to collect system metrics"""
     while True:
         try:
-            monitor.record_system_metric()
-            await asyncio.sleep(60)  # Collect every minute
+            # psutil calls and the error-rate scan stay off the event loop
+            await asyncio.to_thread(monitor.record_system_metric)
+        except Exception as e:
+            logger.error("Error in system metrics collection: %s", e)
+        await asyncio.sleep(SYSTEM_METRICS_INTERVAL_SECONDS)
+
+async def flush_request_metrics():
+    """Background task folding buffered request records into the stats"""
+    while True:
+        await asyncio.sleep(METRICS_FLUSH_INTERVAL_SECONDS)
+        try:
+            # The per-record fold stays off the event loop
+            await asyncio.to_thread(monitor.flush)
         except Exception as e:
-            logger.error(f"Error in system metrics collection: {e}")
-            await asyncio.sleep(60)
+            logger.error("Error flushing request metrics: %s", e)
 
 def start_monitoring():
     """Start the monitoring system"""
+    global _metrics_task, _flush_task
+    if _metrics_task and not _metrics_task.done():
+        return
     try:
         loop = asyncio.get_running_loop()
-        loop.create_task(collect_system_metrics())
-        logger.info("Started performance monitoring system")
     except RuntimeError:
         # No running loop, will start with the app
-        pass
+        return
+    # Keep strong references; the loop only holds tasks weakly
+    _metrics_task = loop.create_task(collect_system_metrics())
+    _flush_task = loop.create_task(flush_request_metrics())
+    logger.info("Started performance monitoring system")
+
+async def stop_monitoring():
+    """Cancel the background metrics tasks and flush what is buffered"""
+    global _metrics_task, _flush_task
+    for task in (_metrics_task, _flush_task):
+        if task is None:
+            continue
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    _metrics_task = _flush_task = None
+    await asyncio.to_thread(monitor.flush)
+
+def get_latest_system_metrics() -> Optional[Dict[str, Any]]:
+    """Most recent sampled system metrics, without touching psutil"""
+    with monitor.lock:
+        if not monitor.system_metrics:
+            return None
+        m = monitor.system_metrics[-1]
+    return {
+        "timestamp": m.timestamp,
+        "cpu_percent": m.cpu_percent,
+        "memory_percent": m.memory_percent,
+        "disk_percent": m.disk_percent,
+    }
 
 # Health check functions
-async def get_health_status() -> Dict[str, Any]:
-    """Get overall system health status"""
+def get_health_status() -> Dict[str, Any]:
+    """Get overall system health status (CPU-bound; call from a worker thread)"""
     summary = monitor.get_performance_summary()
     
     # Determine health status
@@ -432,5 +862,6 @@ async def get_health_status() -> Dict[str, Any]:
         "healthy": is_healthy,
         "issues": issues,
         "summary": summary,
-        "timestamp": datetime.now().isoformat()
+        "system": get_latest_system_metrics(),
+        "timestamp": datetime.now()
     }
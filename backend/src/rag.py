@@ -4,7 +4,7 @@ import logging
 from datetime import datetime
 
 from src.db import supabase, supabase_storage
-from src.embeddings import embed_texts
+from src.embeddings import embed_texts, embed_texts_with_cache_async
 from src.content_filters import (
     filter_boilerplate_content,
     deduplicate_chunks,
@@ -14,6 +14,9 @@ from src.content_filters import (
 
 logger = logging.getLogger(__name__)
 EXPECTED_EMBED_DIM = int(os.getenv("EMBEDDING_DIM", "768"))
+# Rows per PostgREST insert; keeps 768-dim embedding payloads well under
+# the request body limit while still collapsing N round-trips into N/500.
+CHUNK_INSERT_BATCH_SIZE = 500
 
 
 def chunk_texts(
@@ -51,6 +54,13 @@ def chunk_texts(
     return chunks
 
 
+def _delete_document_chunks(client, document_id: str) -> None:
+    try:
+        client.table("document_chunks").delete().eq("policy_id", document_id).execute()
+    except Exception as e:
+        logger.error("Failed to roll back chunks for doc %s: %s", document_id, e)
+
+
 async def index_documents(
     text: str, document_id: str, chunk_size: int = 500, overlap: int = 50
 ) -> List[Tuple[str, Optional[List[float]]]]:
@@ -87,14 +97,10 @@ async def index_documents(
 
     result: List[Tuple[str, Optional[List[float]]]] = []
 
-    # Step 5: Attempt to embed quality chunks; raise exceptions on embedding failures
-    # to ensure the caller knows that RAG indexing failed.
+    # Step 5: Embed quality chunks in concurrent micro-batches; raise exceptions on
+    # embedding failures to ensure the caller knows that RAG indexing failed.
     try:
-        embs = await embed_texts(quality_chunks)
-        if embs is None:
-            raise RuntimeError(
-                "Embedding API returned None - check GEMINI_API_KEY and API status"
-            )
+        embs = await embed_texts_with_cache_async(quality_chunks)
     except Exception as e:
         logger.error("Embedding call failed: %s", e)
         raise RuntimeError(
@@ -132,17 +138,26 @@ async def index_documents(
         rows.append(row)
 
     if rows:
+        start = 0
         try:
-            res = service_client.table("document_chunks").insert(rows).execute()
-            err = getattr(res, "error", None)
-            if err:
-                logger.error("Failed to insert chunks for doc %s: %s", document_id, err)
-                raise RuntimeError(
-                    f"Failed to insert document chunks for {document_id}: {err}"
-                )
+            for start in range(0, len(rows), CHUNK_INSERT_BATCH_SIZE):
+                batch = rows[start : start + CHUNK_INSERT_BATCH_SIZE]
+                res = service_client.table("document_chunks").insert(batch).execute()
+                err = getattr(res, "error", None)
+                if err:
+                    logger.error(
+                        "Failed to insert chunks for doc %s: %s", document_id, err
+                    )
+                    raise RuntimeError(
+                        f"Failed to insert document chunks for {document_id}: {err}"
+                    )
             for idx, chunk in enumerate(quality_chunks):
                 result.append((chunk, embs[idx] if idx < len(embs) else None))
         except Exception as e:
+            if start:
+                # Earlier slices are committed; drop them so retrieval never
+                # searches a partially indexed policy
+                _delete_document_chunks(service_client, document_id)
             if "foreign key constraint" in str(e).lower():
                 raise RuntimeError(
                     f"Cannot index document {document_id}: foreign key constraint failure. Ensure the policy exists in the policies table."
@@ -2,6 +2,7 @@
 Advanced rate limiting system for ClaimWise backend.
 Provides flexible rate limiting with different strategies and smart throttling.
 """
+import math
 import time
 import asyncio
 from typing import Dict, Optional, List, Tuple, Any
@@ -158,17 +159,21 @@ class TokenBucketRateLimiter:
     """Token bucket rate limiter"""
     
     def __init__(self):
-        self._buckets: Dict[str, Dict[str, float]] = defaultdict(lambda: {
-            'tokens': 0.0,
-            'last_update': time.time()
-        })
+        self._buckets: Dict[str, Dict[str, float]] = {}
         self._lock = threading.Lock()
     
     def is_allowed(self, key: str, config: RateLimitConfig) -> RateLimitResult:
         current_time = time.time()
         
         with self._lock:
-            bucket = self._buckets[key]
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                # New clients start with a full bucket so they can burst
+                # up to capacity straight away
+                bucket = self._buckets[key] = {
+                    'tokens': float(config.max_requests + config.burst_allowance),
+                    'last_update': current_time
+                }
             
             # Calculate tokens to add based on time elapsed
             time_elapsed = current_time - bucket['last_update']
@@ -198,7 +203,7 @@ class TokenBucketRateLimiter:
                 )
             else:
                 # Calculate retry after
-                retry_after = int((1.0 - bucket['tokens']) / (config.max_requests / config.window_seconds))
+                retry_after = math.ceil((1.0 - bucket['tokens']) / (config.max_requests / config.window_seconds))
                 reset_time = datetime.fromtimestamp(current_time + retry_after)
                 
                 return RateLimitResult(
@@ -335,13 +340,13 @@ def setup_default_limits():
         burst_allowance=20
     ))
     
-    # Upload rate limit (more restrictive)
+    # Upload rate limit (more restrictive): bucket of 5, refilled at 1/min
     rate_limiter.add_limit("upload", RateLimitConfig(
-        max_requests=10,
+        max_requests=1,
         window_seconds=60,
         strategy=RateLimitStrategy.TOKEN_BUCKET,
         scope=RateLimitScope.USER,
-        burst_allowance=5
+        burst_allowance=4
     ))
     
     # Chat rate limit
@@ -1,12 +1,19 @@
 import os
 import logging
 import tempfile
-import traceback
+from postgrest.types import CountMethod
 
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form
 from src.db import supabase, supabase_storage
 from src.auth import get_current_user
-from src.main_app import _require_debug_routes_enabled, _require_admin_user
+from src.main_app import (
+    _require_debug_routes_enabled,
+    _require_admin_user,
+    _load_policy,
+    _invalidate_policy_cache,
+    _is_test_data,
+    _invalidate_dashboard_stats,
+)
 
 router = APIRouter()
 
@@ -101,7 +108,9 @@ def debug_list_policies(user_id: str = Depends(get_current_user)):
         _require_admin_user(user_id)
         policies = (
             supabase.table("policies")
-            .select("id, policy_name, policy_number, created_at, extracted_text")
+            .select(
+                "id, policy_name, policy_number, created_at, text_length, is_test_data"
+            )
             .eq("user_id", user_id)
             .execute()
             .data
@@ -114,9 +123,8 @@ def debug_list_policies(user_id: str = Depends(get_current_user)):
                     "current_name": policy.get("policy_name"),
                     "policy_number": policy.get("policy_number"),
                     "created_at": policy.get("created_at"),
-                    "text_length": len(policy.get("extracted_text", "")),
-                    "is_test_data": "test insurance policy"
-                    in (policy.get("extracted_text", "")).lower(),
+                    "text_length": policy.get("text_length") or 0,
+                    "is_test_data": bool(policy.get("is_test_data")),
                 }
                 for policy in policies
             ],
@@ -146,6 +154,7 @@ def debug_update_policy_name(
         supabase.table("policies").update({"policy_name": new_name}).eq(
             "id", policy_id
         ).eq("user_id", user_id).execute()
+        _invalidate_policy_cache(policy_id)
         return {
             "message": "Policy name updated successfully",
             "policy_id": policy_id,
@@ -162,21 +171,12 @@ def debug_policy_content(policy_id: str, user_id: str = Depends(get_current_user
     try:
         _require_debug_routes_enabled()
         _require_admin_user(user_id)
-        result = (
-            supabase.table("policies")
-            .select("*")
-            .eq("id", policy_id)
-            .eq("user_id", user_id)
-            .execute()
-        )
-        if not result.data:
+        policy = _load_policy(policy_id, user_id)
+        if not policy:
             raise HTTPException(status_code=404, detail="Policy not found")
-        policy = result.data[0]
-        extracted_text = policy.get("extracted_text", "")
+        extracted_text = policy.get("extracted_text") or ""
         text_length = len(extracted_text)
-        is_test_data = (
-            "test insurance policy for automated testing" in extracted_text.lower()
-        )
+        is_test_data = _is_test_data(extracted_text)
         has_sufficient_content = text_length > 200 and not is_test_data
         return {
             "policy_id": policy_id,
@@ -218,44 +218,31 @@ def create_test_comparison(user_id: str = Depends(get_current_user)):
             .data
         )
         if len(policies) >= 2:
-            result = (
-                supabase.table("comparisons")
-                .insert(
-                    {
-                        "user_id": user_id,
-                        "policy_1_id": policies[0]["id"],
-                        "policy_2_id": policies[1]["id"],
-                        "comparison_result": "Test comparison created for dashboard testing",
-                    }
-                )
-                .execute()
-            )
-            return {
-                "success": True,
-                "message": "Test comparison created",
-                "comparison_id": result.data[0].get("id") if result.data else None,
-            }
+            policy_ids = (policies[0]["id"], policies[1]["id"])
+            message = "Test comparison created"
         else:
-            result = (
-                supabase.table("comparisons")
-                .insert(
-                    {
-                        "user_id": user_id,
-                        "policy_1_id": "test_policy_1",
-                        "policy_2_id": "test_policy_2",
-                        "comparison_result": "Test comparison created for dashboard testing",
-                    }
-                )
-                .execute()
+            policy_ids = ("test_policy_1", "test_policy_2")
+            message = "Test comparison created with placeholder IDs"
+        result = (
+            supabase.table("comparisons")
+            .insert(
+                {
+                    "user_id": user_id,
+                    "policy_1_id": policy_ids[0],
+                    "policy_2_id": policy_ids[1],
+                    "comparison_result": "Test comparison created for dashboard testing",
+                }
             )
-            return {
-                "success": True,
-                "message": "Test comparison created with placeholder IDs",
-                "comparison_id": result.data[0].get("id") if result.data else None,
-            }
+            .execute()
+        )
+        _invalidate_dashboard_stats(user_id)
+        return {
+            "success": True,
+            "message": message,
+            "comparison_id": result.data[0].get("id") if result.data else None,
+        }
     except Exception as e:
         logging.exception("Error creating test comparison: %s", e)
-        traceback.print_exc()
         raise HTTPException(status_code=500, detail="Error creating test comparison.")
 
 
@@ -264,15 +251,19 @@ def test_comparisons_table(user_id: str = Depends(get_current_user)):
     try:
         _require_debug_routes_enabled()
         _require_admin_user(user_id)
-        result = supabase.table("comparisons").select("*").limit(10).execute()
+        result = (
+            supabase.table("comparisons")
+            .select("*", count=CountMethod.exact)
+            .limit(5)
+            .execute()
+        )
         return {
             "success": True,
-            "total_comparisons": len(result.data) if result.data else 0,
-            "sample_data": result.data[:5] if result.data else [],
+            "total_comparisons": result.count or 0,
+            "sample_data": result.data or [],
         }
     except Exception as e:
         logging.exception("Error querying comparisons table: %s", e)
-        traceback.print_exc()
         return {
             "success": False,
             "error": "Query failed",
@@ -12,24 +12,33 @@ router = APIRouter()
 
 @router.post("/analyze-policy")
 def analyze(policy_id: str = Form(...), user_id: str = Depends(get_current_user)):
-    from src.main_app import _enforce_user_rate_limit
+    from src.main_app import (
+        _enforce_user_rate_limit,
+        _load_policy,
+        _invalidate_dashboard_stats,
+    )
 
     _enforce_user_rate_limit("analysis", user_id, "/analyze-policy")
     try:
-        result = (
-            supabase.table("policies")
-            .select("extracted_text", "policy_number", "policy_name")
-            .eq("id", policy_id)
-            .eq("user_id", user_id)
-            .execute()
-        )
-        if not result.data:
+        policy = _load_policy(policy_id, user_id)
+        if not policy:
             raise HTTPException(
                 status_code=404, detail="Policy not found for this user."
             )
-        policy = result.data[0]
         analysis = analyze_policy(policy["extracted_text"])
-        metadata = policy.get("validation_metadata") or {}
+        # validation_metadata is mutable, so read it fresh rather than from the
+        # cached policy content before merging the analysis into it.
+        metadata_rows = (
+            supabase.table("policies")
+            .select("validation_metadata")
+            .eq("id", policy_id)
+            .limit(1)
+            .execute()
+            .data
+        )
+        metadata = (
+            metadata_rows[0].get("validation_metadata") if metadata_rows else None
+        ) or {}
         if not isinstance(metadata, dict):
             metadata = {}
         metadata["analysis_result"] = analysis
@@ -52,6 +61,7 @@ def analyze(policy_id: str = Form(...), user_id: str = Depends(get_current_user)
         supabase.table("policies").update(
             {"validation_metadata": metadata, "validation_score": validation_score}
         ).eq("id", policy_id).execute()
+        _invalidate_dashboard_stats(user_id)
         log_activity(
             user_id=user_id,
             activity_type="analysis",
@@ -74,33 +84,23 @@ def analyze(policy_id: str = Form(...), user_id: str = Depends(get_current_user)
 
 @router.post("/compare-policies")
 def compare(request: CompareRequest, user_id: str = Depends(get_current_user)):
-    from src.main_app import _enforce_user_rate_limit
+    from src.main_app import (
+        _enforce_user_rate_limit,
+        _load_policy,
+        _invalidate_dashboard_stats,
+    )
 
     _enforce_user_rate_limit("analysis", user_id, "/compare-policies")
     try:
         policy_ids = request.policy_ids
         policy_1_id = policy_ids[0]
         policy_2_id = policy_ids[1]
-        res1 = (
-            supabase.table("policies")
-            .select("extracted_text", "policy_number", "policy_name")
-            .eq("id", policy_1_id)
-            .eq("user_id", user_id)
-            .execute()
-        )
-        res2 = (
-            supabase.table("policies")
-            .select("extracted_text", "policy_number", "policy_name")
-            .eq("id", policy_2_id)
-            .eq("user_id", user_id)
-            .execute()
-        )
-        if not res1.data or not res2.data:
+        pol1 = _load_policy(policy_1_id, user_id)
+        pol2 = _load_policy(policy_2_id, user_id)
+        if not pol1 or not pol2:
             raise HTTPException(
                 status_code=404, detail="One or both policies not found for this user."
             )
-        pol1 = res1.data[0]
-        pol2 = res2.data[0]
         comparison_result_text = compare_policies(
             pol1["extracted_text"],
             pol2["extracted_text"],
@@ -114,6 +114,7 @@ def compare(request: CompareRequest, user_id: str = Depends(get_current_user)):
             "comparison_result": comparison_result_text,
         }
         result = supabase.table("comparisons").insert(comparison_data).execute()
+        _invalidate_dashboard_stats(user_id)
         log_activity(
             user_id=user_id,
             activity_type="comparison",
@@ -1,4 +1,5 @@
 import os
+import asyncio
 import logging
 import tempfile
 
@@ -25,11 +26,12 @@ async def test_gemini(file: UploadFile, user_id: str = Depends(get_current_user)
             temp_file_path = temp_file.name
         from src.gemini_files import upload_pdf, poll_file_status, extract_text
 
-        file_id, file_uri = upload_pdf(temp_file_path)
-        status = poll_file_status(file_id)
+        # poll_file_status sleeps between polls; keep all of it off the event loop
+        file_id, file_uri = await asyncio.to_thread(upload_pdf, temp_file_path)
+        status = await asyncio.to_thread(poll_file_status, file_id)
         if status != "ACTIVE":
             raise HTTPException(status_code=500, detail="File did not become ACTIVE")
-        extracted_text = extract_text(temp_file_path)
+        extracted_text = await asyncio.to_thread(extract_text, temp_file_path)
         return {
             "file_id": file_id,
             "file_uri": file_uri,
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -12,24 +13,17 @@ router = APIRouter()
 
 @router.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest, user_id: str = Depends(get_current_user)):
-    from src.main_app import _enforce_user_rate_limit
+    from src.main_app import _enforce_user_rate_limit, _load_policy
 
     _enforce_user_rate_limit("chat", user_id, "/chat")
     try:
         policy_id = request.policy_id
         question = request.question
-        result = (
-            supabase.table("policies")
-            .select("extracted_text", "policy_number", "policy_name")
-            .eq("id", policy_id)
-            .eq("user_id", user_id)
-            .execute()
-        )
-        if not result.data:
+        policy = await asyncio.to_thread(_load_policy, policy_id, user_id)
+        if not policy:
             raise HTTPException(
                 status_code=404, detail="Policy not found for this user."
             )
-        policy = result.data[0]
         extracted_text = policy.get("extracted_text", "")
         if not extracted_text or len(extracted_text) < 50:
             return ChatResponse(
@@ -67,14 +61,14 @@ async def chat(request: ChatRequest, user_id: str = Depends(get_current_user)):
         try:
             from src.llm import make_llm_request
 
-            answer = make_llm_request(final_prompt)
+            answer = await asyncio.to_thread(make_llm_request, final_prompt)
         except Exception as e:
             logging.exception("Gemini generation failed, trying fallback: %s", e)
             try:
                 from src.llm_groq import chat_with_policy as fallback_chat
 
-                answer = fallback_chat(
-                    extracted_text, question, policy.get("policy_number")
+                answer = await asyncio.to_thread(
+                    fallback_chat, extracted_text, question, policy.get("policy_number")
                 )
             except Exception as e2:
                 logging.exception("Fallback chat failed: %s", e2)
@@ -92,14 +86,18 @@ async def chat(request: ChatRequest, user_id: str = Depends(get_current_user)):
                 "chat_type": "single_policy",
             },
         )
-        supabase.table("chat_logs").insert(
-            {
-                "user_id": user_id,
-                "policy_id": policy_id,
-                "question": question,
-                "answer": str(answer) if answer is not None else "",
-            }
-        ).execute()
+        await asyncio.to_thread(
+            supabase.table("chat_logs")
+            .insert(
+                {
+                    "user_id": user_id,
+                    "policy_id": policy_id,
+                    "question": question,
+                    "answer": str(answer) if answer is not None else "",
+                }
+            )
+            .execute
+        )
         hc = cache_manager.create_cache("history", default_ttl=30)
         hc.clear()
         return ChatResponse(
@@ -127,8 +125,10 @@ def chat_multiple_policies(
         question = request.question
         policies = (
             supabase.table("policies")
-            .select("id", "extracted_text", "policy_number")
+            .select("id,extracted_text,policy_number")
             .eq("user_id", user_id)
+            .not_.is_("extracted_text", "null")
+            .neq("extracted_text", "")
             .execute()
             .data
         )
@@ -136,20 +136,9 @@ def chat_multiple_policies(
             raise HTTPException(
                 status_code=404, detail="No policies found for this user."
             )
-        policies_data = []
-        for policy in policies:
-            policies_data.append(
-                {
-                    "id": policy["id"],
-                    "extracted_text": policy["extracted_text"],
-                    "policy_number": policy.get(
-                        "policy_number", f"Policy {policy['id']}"
-                    ),
-                }
-            )
         from src.llm_groq import chat_with_multiple_policies
 
-        answer = chat_with_multiple_policies(policies_data, question)
+        answer = chat_with_multiple_policies(policies, question)
         if not answer:
             answer = "I could not generate a comprehensive response across your policies. Please try again."
         answer_str = str(answer) if answer is not None else ""
@@ -1,14 +1,25 @@
+import hashlib
 import logging
 import re
+from collections import Counter
 from datetime import datetime
+from operator import itemgetter
+from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from src.db import supabase
+import orjson
+from postgrest.types import CountMethod
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from src.db import supabase, supabase_storage
 from src.auth import get_current_user
 from src.caching import cache_manager
 
 router = APIRouter()
 
+DASHBOARD_STATS_MAX_AGE = 30
+# PostgREST renames created_at so rows come back already in the response shape
+ACTIVITY_FIELDS = "id,type,title,description,timestamp:created_at,status,details"
+ACTIVITIES_PAGE_SIZE = 10
+
 
 @router.get("/history")
 def get_comprehensive_history(
@@ -26,53 +37,29 @@ def get_comprehensive_history(
         page_size = max(1, min(page_size, 100))
         offset = (page - 1) * page_size
 
-        activities = []
+        history = {}
         try:
-            activities = (
-                supabase.table("activities")
-                .select("*")
-                .eq("user_id", user_id)
-                .order("created_at", desc=True)
-                .range(offset, offset + page_size - 1)
+            history = (
+                supabase.rpc(
+                    "get_user_history",
+                    {"uid": user_id, "lim": page_size, "off": offset},
+                )
                 .execute()
                 .data
+                or {}
             )
         except Exception as e:
-            logging.exception("Error fetching activities: %s", e)
-            activities = []
-
-        total_activities = 0
-        try:
-            count_result = (
-                supabase.table("activities")
-                .select("id", {"count": "exact", "head": True})
-                .eq("user_id", user_id)
-                .execute()
-            )
-            total_activities = int(getattr(count_result, "count", 0) or 0)
-        except Exception as e:
-            logging.exception("Error counting activities: %s", e)
-
-        formatted = []
-        for act in activities:
-            formatted.append(
-                {
-                    "id": act.get("id", ""),
-                    "type": act.get("type", "unknown"),
-                    "title": act.get("title", ""),
-                    "description": act.get("description", ""),
-                    "timestamp": act.get("created_at", ""),
-                    "status": act.get("status", "completed"),
-                    "details": act.get("details", {}),
-                }
-            )
+            logging.exception("Error fetching activity history: %s", e)
+        formatted = history.get("activities") or []
+        total_activities = int(history.get("total_activities") or 0)
 
+        type_counts = Counter(map(itemgetter("type"), formatted))
         stats = {
             "totalActivities": total_activities,
-            "uploads": len([a for a in formatted if a["type"] == "upload"]),
-            "analyses": len([a for a in formatted if a["type"] == "analysis"]),
-            "chats": len([a for a in formatted if a["type"] == "chat"]),
-            "comparisons": len([a for a in formatted if a["type"] == "comparison"]),
+            "uploads": type_counts["upload"],
+            "analyses": type_counts["analysis"],
+            "chats": type_counts["chat"],
+            "comparisons": type_counts["comparison"],
             "totalPolicies": 0,
         }
 
@@ -103,8 +90,66 @@ def get_comprehensive_history(
         )
 
 
+def _with_etag(request: Request, response: Response, payload: Any):
+    """Tag a private, briefly cacheable payload and answer 304 if the client has it."""
+    body = orjson.dumps(payload, default=str, option=orjson.OPT_SORT_KEYS)
+    etag = f'W/"{hashlib.md5(body).hexdigest()}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={DASHBOARD_STATS_MAX_AGE}",
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return payload
+
+
 @router.get("/activities")
-def get_activities(user_id: str = Depends(get_current_user)):
+def get_activities(
+    request: Request,
+    response: Response,
+    before: Optional[str] = None,
+    user_id: str = Depends(get_current_user),
+):
+    if before:
+        result = _load_activities_before(user_id, before)
+    else:
+        result = _load_activities(user_id)
+    if not result.get("success"):
+        return result
+    return _with_etag(request, response, result)
+
+
+def _next_cursor(rows: list) -> Optional[str]:
+    return rows[-1]["timestamp"] if len(rows) == ACTIVITIES_PAGE_SIZE else None
+
+
+def _load_activities_before(user_id: str, before: str) -> Dict[str, Any]:
+    """Keyset page of activities older than ``before`` (a previous nextCursor)."""
+    try:
+        rows = (
+            supabase.table("activities")
+            .select(ACTIVITY_FIELDS)
+            .eq("user_id", user_id)
+            .lt("created_at", before)
+            .order("created_at", desc=True)
+            .limit(ACTIVITIES_PAGE_SIZE)
+            .execute()
+            .data
+            or []
+        )
+        return {
+            "activities": rows,
+            "total": len(rows),
+            "nextCursor": _next_cursor(rows),
+            "success": True,
+        }
+    except Exception as e:
+        logging.exception("Error fetching activities before %s: %s", before, e)
+        return {"activities": [], "total": 0, "success": False, "error": str(e)}
+
+
+def _load_activities(user_id: str) -> Dict[str, Any]:
     try:
         cache = cache_manager.create_cache("activities", max_size=1000, default_ttl=30)
         cached = cache.get(f"activities:{user_id}")
@@ -112,10 +157,10 @@ def get_activities(user_id: str = Depends(get_current_user)):
             return cached
         activities = (
             supabase.table("activities")
-            .select("*")
+            .select(ACTIVITY_FIELDS)
             .eq("user_id", user_id)
             .order("created_at", desc=True)
-            .limit(10)
+            .limit(ACTIVITIES_PAGE_SIZE)
             .execute()
         )
         if (
@@ -124,20 +169,13 @@ def get_activities(user_id: str = Depends(get_current_user)):
             and isinstance(activities.data, list)
             and len(activities.data) > 0
         ):
-            formatted = []
-            for activity in activities.data:
-                formatted.append(
-                    {
-                        "id": activity["id"],
-                        "type": activity["type"],
-                        "title": activity["title"],
-                        "description": activity["description"],
-                        "timestamp": activity["created_at"],
-                        "status": activity["status"],
-                        "details": activity.get("details", {}),
-                    }
-                )
-            result = {"activities": formatted, "total": len(formatted), "success": True}
+            formatted = activities.data
+            result = {
+                "activities": formatted,
+                "total": len(formatted),
+                "nextCursor": _next_cursor(formatted),
+                "success": True,
+            }
             cache.set(f"activities:{user_id}", result)
             return result
         else:
@@ -195,47 +233,52 @@ def get_activities(user_id: str = Depends(get_current_user)):
         return {"activities": [], "total": 0, "success": False, "error": str(e)}
 
 
+def _fetch_dashboard_counts(uid: Optional[str]) -> Dict[str, int]:
+    if uid:
+        # RLS only lets a user's own JWT read the row; the server reads it
+        # with the service-role client
+        rows = (
+            supabase_storage.table("user_dashboard_stats")
+            .select("uploaded,processed,analyses,comparisons")
+            .eq("user_id", uid)
+            .limit(1)
+            .execute()
+            .data
+            or []
+        )
+    else:
+        rows = supabase.rpc("dashboard_stats", {"uid": uid}).execute().data or []
+    row = rows[0] if rows else {}
+    return {
+        "uploaded": int(row.get("uploaded") or 0),
+        "processed": int(row.get("processed") or 0),
+        "analyses": int(row.get("analyses") or 0),
+        "comparisons": int(row.get("comparisons") or 0),
+    }
+
+
 @router.get("/dashboard/stats")
-def dashboard_stats(user_id: str = Depends(get_current_user)):
+def dashboard_stats(
+    request: Request, response: Response, user_id: str = Depends(get_current_user)
+):
     try:
         cache = cache_manager.create_cache("dashboard", max_size=1000, default_ttl=60)
         cached = cache.get(f"stats:{user_id}")
         if cached:
-            return cached
-        uploaded_count = 0
-        try:
-            policies = (
-                supabase.table("policies").select("id").eq("user_id", user_id).execute()
-            )
-            uploaded_count = (
-                len(policies.data) if policies and policies.data is not None else 0
-            )
-        except Exception as e:
-            logging.exception("Error counting policies: %s", e)
-            uploaded_count = 0
-        documents_processed = uploaded_count
-        analyses_completed = uploaded_count
-        comparisons_run = 0
+            return _with_etag(request, response, cached)
+        counts = {"uploaded": 0, "processed": 0, "analyses": 0, "comparisons": 0}
         try:
-            comparisons = (
-                supabase.table("comparisons")
-                .select("id")
-                .eq("user_id", user_id)
-                .execute()
-                .data
-            )
-            comparisons_run = len(comparisons) if comparisons else 0
+            counts = _fetch_dashboard_counts(user_id)
         except Exception as e:
-            logging.exception("Error counting comparisons: %s", e)
-            comparisons_run = 0
+            logging.exception("Error fetching dashboard counts: %s", e)
         result = {
-            "uploadedDocuments": uploaded_count,
-            "documentsProcessed": documents_processed,
-            "analysesCompleted": analyses_completed,
-            "comparisonsRun": comparisons_run,
+            "uploadedDocuments": counts["uploaded"],
+            "documentsProcessed": counts["processed"],
+            "analysesCompleted": counts["analyses"],
+            "comparisonsRun": counts["comparisons"],
         }
         cache.set(f"stats:{user_id}", result)
-        return result
+        return _with_etag(request, response, result)
     except Exception as e:
         logging.exception("Exception in dashboard_stats: %s", str(e))
         raise HTTPException(status_code=500, detail="Error fetching dashboard stats.")
@@ -253,31 +296,13 @@ def dashboard_stats_dev(user_id: str = Depends(get_current_user)):
         analyses_completed = 0
         comparisons_run = 0
         try:
-            policies_res = (
-                supabase.table("policies").select("id", "extracted_text").execute()
-            )
-            policies = policies_res.data if policies_res and policies_res.data else []
-            uploaded_count = len(policies)
-            documents_processed = len([p for p in policies if p.get("extracted_text")])
-        except Exception as e:
-            logging.exception("/dashboard/stats-dev - policies query failed: %s", e)
-        try:
-            analyses_res = supabase.table("analyses").select("id").execute()
-            analyses_completed = (
-                len(analyses_res.data) if analyses_res and analyses_res.data else 0
-            )
-        except Exception:
-            analyses_completed = uploaded_count
-        try:
-            comparisons_res = supabase.table("comparisons").select("id").execute()
-            comparisons_run = (
-                len(comparisons_res.data)
-                if comparisons_res and comparisons_res.data
-                else 0
-            )
+            counts = _fetch_dashboard_counts(None)
+            uploaded_count = counts["uploaded"]
+            documents_processed = counts["processed"]
+            analyses_completed = counts["analyses"]
+            comparisons_run = counts["comparisons"]
         except Exception as e:
-            logging.exception("/dashboard/stats-dev - comparisons query failed: %s", e)
-            comparisons_run = 0
+            logging.exception("/dashboard/stats-dev - counts query failed: %s", e)
         if (
             uploaded_count == 0
             and documents_processed == 0
@@ -400,8 +425,14 @@ def dashboard_metrics_dev(user_id: str = Depends(get_current_user)):
     _require_debug_routes_enabled()
     _require_admin_user(user_id)
     try:
-        policies_res = supabase.table("policies").select("*").execute()
+        policies_res = (
+            supabase.table("policies")
+            .select("*", count=CountMethod.exact)
+            .limit(5)
+            .execute()
+        )
         policies = policies_res.data if policies_res and policies_res.data else []
+        policies_count = policies_res.count or len(policies)
         protection_score = 78
         risks_found = 0
         total_coverage = 0
@@ -409,17 +440,22 @@ def dashboard_metrics_dev(user_id: str = Depends(get_current_user)):
             validation_scores = []
             risk_count = 0
             coverage_amounts = []
-            for policy in policies[:5]:
+            sampled = policies
+            analyses_res = (
+                supabase.table("analyses")
+                .select("policy_id, analysis_result")
+                .in_("policy_id", [p["id"] for p in sampled])
+                .execute()
+            )
+            analysis_by_policy = {}
+            for row in analyses_res.data or []:
+                analysis_by_policy.setdefault(row["policy_id"], row)
+            for policy in sampled:
                 validation_score = policy.get("validation_score", 0.75)
                 validation_scores.append(validation_score * 100)
-                analysis = (
-                    supabase.table("analyses")
-                    .select("analysis_result")
-                    .eq("policy_id", policy["id"])
-                    .execute()
-                )
-                if analysis.data:
-                    analysis_result = analysis.data[0].get("analysis_result", {})
+                analysis = analysis_by_policy.get(policy["id"])
+                if analysis:
+                    analysis_result = analysis.get("analysis_result", {})
                     if isinstance(analysis_result, dict):
                         risk_count += len(analysis_result.get("gaps_and_risks", []))
                 coverage = policy.get("coverage_amount")
@@ -447,7 +483,7 @@ def dashboard_metrics_dev(user_id: str = Depends(get_current_user)):
             "risksFound": risks_found,
             "totalCoverage": total_coverage_formatted,
             "quickInsight": quick_insight,
-            "policiesCount": len(policies),
+            "policiesCount": policies_count,
         }
     except Exception as e:
         logging.exception("Exception in dashboard_metrics_dev: %s", str(e))
@@ -1,4 +1,7 @@
+import asyncio
+
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 from src.auth import get_current_user
 from src.monitoring import monitor, get_health_status
 
@@ -20,7 +23,7 @@ def monitoring_summary(user_id: str = Depends(get_current_user)):
     from src.main_app import _require_admin_user
 
     _require_admin_user(user_id)
-    return monitor.get_performance_summary()
+    return ORJSONResponse(monitor.get_performance_summary())
 
 
 @router.get("/monitoring/endpoints")
@@ -28,12 +31,19 @@ def monitoring_endpoints(user_id: str = Depends(get_current_user)):
     from src.main_app import _require_admin_user
 
     _require_admin_user(user_id)
-    return monitor.get_endpoint_stats()
+    return ORJSONResponse(monitor.get_endpoint_stats())
 
 
 @router.get("/monitoring/health")
 async def monitoring_health(user_id: str = Depends(get_current_user)):
     from src.main_app import _require_admin_user
 
-    _require_admin_user(user_id)
-    return await get_health_status()
+    # The admin lookup is a DB round trip and the summary is pure CPU work;
+    # overlap them. A failed admin check raises before anything is returned.
+    _, health = await asyncio.gather(
+        asyncio.to_thread(_require_admin_user, user_id),
+        asyncio.to_thread(get_health_status),
+    )
+    # Returned as a Response so FastAPI skips jsonable_encoder; orjson
+    # encodes the datetimes itself
+    return ORJSONResponse(health)
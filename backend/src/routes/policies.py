@@ -1,10 +1,13 @@
 import os
+import hashlib
 import logging
 import tempfile
-import time
 import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Union, Dict, Any, Optional
+from pathlib import Path
+from typing import Union, Dict, Any, Optional, Tuple
 from postgrest.types import CountMethod
 
 from fastapi import (
@@ -22,10 +25,17 @@ from src.db import supabase, supabase_storage
 from src.auth import get_current_user, oauth2_scheme
 from src.models import UploadResponse
 from src.document_validator import validate_insurance_document
+from src.gemini_files import extract_text, extract_text_from_bytes
+from src.rag import index_documents
 from src.repositories.policy_repository import PolicyRepository
 from src.services.activity_service import log_activity
 from src.caching import cache_manager
-from src.main_app import _duplicate_conflict_detail, _enforce_user_rate_limit
+from src.main_app import (
+    _duplicate_conflict_detail,
+    _enforce_user_rate_limit,
+    _invalidate_policy_cache,
+    _is_test_data,
+)
 
 router = APIRouter()
 policy_repo = PolicyRepository()
@@ -34,18 +44,54 @@ STORAGE_BUCKET = os.getenv("SUPABASE_STORAGE_BUCKET", "project")
 APP_ENV = os.getenv("APP_ENV", os.getenv("ENVIRONMENT", "development")).lower()
 MAX_UPLOAD_SIZE_MB = int(os.getenv("MAX_UPLOAD_SIZE_MB", "10"))
 MAX_UPLOAD_BYTES = MAX_UPLOAD_SIZE_MB * 1024 * 1024
-ALLOWED_UPLOAD_EXTENSIONS = {"pdf"}
-ALLOWED_UPLOAD_MIME_TYPES = {"application/pdf"}
+ALLOWED_UPLOAD_EXTENSIONS = frozenset({".pdf"})
+ALLOWED_UPLOAD_MIME_TYPES = frozenset({"application/pdf"})
 ENABLE_DOCUMENT_VALIDATION = (
     os.getenv("ENABLE_DOCUMENT_VALIDATION", "true").lower() == "true"
 )
 SIGNED_URL_TTL_SECONDS = int(os.getenv("SIGNED_URL_TTL_SECONDS", "3600"))
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(os.cpu_count() or 1)))
+
+# PyPDF2 parsing is pure-Python CPU work that holds the GIL, so it runs in
+# worker processes. Workers are spawned (not forked) because this process
+# already runs logging, monitoring and activity threads.
+extraction_pool = ProcessPoolExecutor(
+    max_workers=EXTRACTION_WORKERS,
+    mp_context=multiprocessing.get_context("spawn"),
+)
+
+# Indexing embeds every chunk and writes vectors; cap how many policies are
+# indexed at once so an upload spike queues instead of exhausting memory.
+INDEX_CONCURRENCY = int(os.getenv("INDEX_CONCURRENCY", "4"))
+_index_semaphore = asyncio.Semaphore(INDEX_CONCURRENCY)
+# Strong references to in-flight background indexing tasks
+_index_tasks: set = set()
 
 
-async def _validate_and_extract_file(file: UploadFile) -> tuple[bytes, str]:
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Uploads up to this size are kept in memory and never touch the disk
+IN_MEMORY_UPLOAD_BYTES = 5 * 1024 * 1024
+
+
+def _remove_temp_file(path: Union[bytes, str, None]) -> None:
+    if isinstance(path, str) and os.path.exists(path):
+        try:
+            os.unlink(path)
+        except OSError as cleanup_err:
+            logging.warning("Failed to clean up temp file %s: %s", path, cleanup_err)
+
+
+async def _spool_upload_file(file: UploadFile) -> Tuple[Union[bytes, str], str]:
+    """Read the upload, hashing it as it arrives.
+
+    Returns ``(source, sha256_hex)``. Files up to ``IN_MEMORY_UPLOAD_BYTES``
+    come back as ``bytes``; larger ones spill to a temp file and ``source`` is
+    its path, which the caller owns. An oversized upload is rejected as soon
+    as it crosses the limit.
+    """
     if not file.filename:
         raise HTTPException(status_code=400, detail="File must have a valid filename")
-    file_type = file.filename.rsplit(".", 1)[-1].lower() if "." in file.filename else ""
+    file_type = os.path.splitext(file.filename)[1].lower()
     if file_type not in ALLOWED_UPLOAD_EXTENSIONS:
         raise HTTPException(status_code=400, detail="Only PDF files are supported.")
     content_type = (file.content_type or "").lower().strip()
@@ -61,71 +107,114 @@ async def _validate_and_extract_file(file: UploadFile) -> tuple[bytes, str]:
             status_code=413,
             detail=f"File is too large. Max allowed size is {MAX_UPLOAD_SIZE_MB}MB.",
         )
-    file_bytes = await file.read()
-    if len(file_bytes) > MAX_UPLOAD_BYTES:
-        raise HTTPException(
-            status_code=413,
-            detail=f"File is too large. Max allowed size is {MAX_UPLOAD_SIZE_MB}MB.",
-        )
-    temp_file_path = None
+    digest = hashlib.sha256()
+    size = 0
+    buffer = bytearray()
+    temp_file = None
     try:
-        with tempfile.NamedTemporaryFile(
-            delete=False, suffix=f"_{file.filename}"
-        ) as temp_file:
-            temp_file.write(file_bytes)
-            temp_file_path = temp_file.name
-        try:
-            from src.gemini_files import extract_text
-        except ImportError as import_err:
-            logging.exception("Failed to import gemini_files: %s", import_err)
-            raise HTTPException(
-                status_code=500,
-                detail="Server misconfiguration: PDF extraction module not available",
-            )
-        extracted_text = extract_text(temp_file_path)
-        if not extracted_text:
-            raise HTTPException(status_code=400, detail="No text extracted from file.")
-    finally:
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.unlink(temp_file_path)
-            except OSError as cleanup_err:
-                logging.warning(
-                    "Failed to clean up temp file %s: %s", temp_file_path, cleanup_err
+        while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+            size += len(chunk)
+            if size > MAX_UPLOAD_BYTES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File is too large. Max allowed size is {MAX_UPLOAD_SIZE_MB}MB.",
+                )
+            digest.update(chunk)
+            if temp_file is None and size <= IN_MEMORY_UPLOAD_BYTES:
+                buffer += chunk
+                continue
+            if temp_file is None:
+                temp_file = tempfile.NamedTemporaryFile(
+                    delete=False, suffix=f"_{file.filename}"
                 )
-    return file_bytes, extracted_text
+                temp_file.write(buffer)
+                buffer.clear()
+            temp_file.write(chunk)
+    except BaseException:
+        if temp_file is not None:
+            temp_file.close()
+            _remove_temp_file(temp_file.name)
+        raise
+    if temp_file is None:
+        return bytes(buffer), digest.hexdigest()
+    temp_file.close()
+    return temp_file.name, digest.hexdigest()
+
+
+async def _extract_file_text(source: Union[bytes, str]) -> str:
+    extract = extract_text_from_bytes if isinstance(source, bytes) else extract_text
+    extracted_text = await asyncio.get_running_loop().run_in_executor(
+        extraction_pool, extract, source
+    )
+    if not extracted_text:
+        raise HTTPException(status_code=400, detail="No text extracted from file.")
+    return extracted_text
 
 
-def _upload_to_storage(file_bytes: bytes, user_id: str, filename: str) -> Optional[str]:
-    storage_path = f"policies/{user_id}/{filename}"
+def _find_existing_upload(user_id: str, file_hash: str) -> Optional[Dict[str, Any]]:
     try:
-        supabase_storage.storage.from_(STORAGE_BUCKET).upload(storage_path, file_bytes)
-        return storage_path
-    except Exception as upload_error:
-        error_str = str(upload_error)
-        if "Duplicate" not in error_str and "already exists" not in error_str:
-            raise
-        timestamp = str(int(time.time()))
-        filename_parts = filename.rsplit(".", 1)
-        unique_filename = (
-            f"{filename_parts[0]}_{timestamp}.{filename_parts[1]}"
-            if len(filename_parts) == 2
-            else f"{filename}_{timestamp}"
+        rows = (
+            supabase.table("policies")
+            .select("id,extracted_text,uploaded_file_url")
+            .eq("user_id", user_id)
+            .eq("file_hash", file_hash)
+            .limit(1)
+            .execute()
+            .data
         )
-        storage_path = f"policies/{user_id}/{unique_filename}"
-        supabase_storage.storage.from_(STORAGE_BUCKET).upload(storage_path, file_bytes)
-        return storage_path
+        return rows[0] if rows else None
+    except Exception as e:
+        logging.warning("Duplicate upload lookup failed; processing file: %s", e)
+        return None
 
 
-async def _save_policy_and_index(
-    data: dict,
-    user_id: str,
-    sync_indexing: bool,
-    background_tasks: BackgroundTasks,
-) -> UploadResponse:
+def _storage_path(user_id: str, filename: str, file_hash: str) -> str:
+    # Content-addressed so the path is known before the upload finishes and the
+    # DB insert can run alongside it.
+    return f"policies/{user_id}/{file_hash[:16]}_{filename}"
+
+
+def _upload_to_storage(source: Union[bytes, str], storage_path: str) -> None:
+    # The path is content-addressed, so overwriting an existing object writes
+    # the same bytes; upsert avoids a thrown-and-matched "Duplicate" error.
+    supabase_storage.storage.from_(STORAGE_BUCKET).upload(
+        storage_path,
+        source if isinstance(source, bytes) else Path(source),
+        file_options={"upsert": "true"},
+    )
+
+
+def _remove_from_storage(storage_path: str) -> None:
+    try:
+        supabase_storage.storage.from_(STORAGE_BUCKET).remove([storage_path])
+    except Exception as e:
+        logging.warning("Failed to remove orphaned upload %s: %s", storage_path, e)
+
+
+def _delete_policy_row(policy_id: str) -> None:
+    try:
+        (supabase_storage or supabase).table("policies").delete().eq(
+            "id", policy_id
+        ).execute()
+    except Exception as e:
+        logging.warning("Failed to roll back policy %s: %s", policy_id, e)
+
+
+async def _index_in_background(extracted_text: str, policy_id: str) -> None:
+    try:
+        async with _index_semaphore:
+            await index_documents(extracted_text, policy_id)
+    except Exception as e:
+        logging.exception("Background indexing failed: %s", e)
+
+
+async def _save_policy(data: dict, user_id: str) -> str:
+    """Insert the policy row and return its id"""
     svc = supabase_storage or supabase
     try:
-        user_check = svc.table("users").select("id").eq("id", user_id).execute()
+        user_check = await asyncio.to_thread(
+            svc.table("users").select("id").eq("id", user_id).execute
+        )
         if not (user_check and getattr(user_check, "data", None)):
             raise HTTPException(
                 status_code=403,
@@ -136,7 +225,7 @@ async def _save_policy_and_index(
     except (OSError, ValueError):
         logging.warning("Could not verify user existence prior to insert; continuing")
 
-    response = svc.table("policies").insert(data).execute()
+    response = await asyncio.to_thread(svc.table("policies").insert(data).execute)
     resp_err = getattr(response, "error", None)
     if resp_err:
         logging.error("Supabase insert error: %s", resp_err)
@@ -160,29 +249,22 @@ async def _save_policy_and_index(
     if not (response and getattr(response, "data", None)):
         raise HTTPException(status_code=500, detail="Failed to save policy.")
 
-    policy_id = response.data[0]["id"]
-    extracted_text = data.get("extracted_text", "")
+    return response.data[0]["id"]
 
+
+async def _start_indexing(
+    extracted_text: str, policy_id: str, sync_indexing: bool
+) -> UploadResponse:
     if sync_indexing:
         try:
-            from src.rag import index_documents
-
-            await index_documents(extracted_text, policy_id)
+            async with _index_semaphore:
+                await index_documents(extracted_text, policy_id)
         except Exception as e:
             logging.exception("Synchronous indexing failed: %s", e)
     else:
-        try:
-            from src.rag import index_documents
-
-            async def _run_indexing():
-                try:
-                    await index_documents(extracted_text, policy_id)
-                except Exception as e:
-                    logging.exception("Background indexing failed: %s", e)
-
-            asyncio.ensure_future(_run_indexing())
-        except Exception as e:
-            logging.exception("Failed to schedule background indexing: %s", e)
+        task = asyncio.create_task(_index_in_background(extracted_text, policy_id))
+        _index_tasks.add(task)
+        task.add_done_callback(_index_tasks.discard)
 
     return UploadResponse(
         policy_id=policy_id,
@@ -238,61 +320,93 @@ async def upload_policy(
     if not file and not text_input:
         raise HTTPException(status_code=400, detail="Provide a file or text.")
 
+    upload_path = file_hash = None
     if file:
-        file_bytes, extracted_text = await _validate_and_extract_file(file)
-    else:
-        file_bytes, extracted_text = None, text_input
-
-    if ENABLE_DOCUMENT_VALIDATION and extracted_text:
-        source_name = file.filename if file and file.filename else "text_input"
-        validation_report = validate_insurance_document(extracted_text, source_name)
-        if not validation_report.is_valid:
-            raise HTTPException(
-                status_code=400,
-                detail="Uploaded content does not appear to be a valid insurance policy document.",
+        upload_path, file_hash = await _spool_upload_file(file)
+    try:
+        if file:
+            existing = await asyncio.to_thread(
+                _find_existing_upload, user_id, file_hash
             )
+            if existing:
+                return UploadResponse(
+                    policy_id=existing["id"],
+                    extracted_text=existing.get("extracted_text") or "",
+                    status="already_uploaded",
+                )
+            extracted_text = await _extract_file_text(upload_path)
+        else:
+            extracted_text = text_input
+
+        if ENABLE_DOCUMENT_VALIDATION and extracted_text:
+            source_name = file.filename if file and file.filename else "text_input"
+            validation_report = await asyncio.to_thread(
+                validate_insurance_document, extracted_text, source_name
+            )
+            if not validation_report.is_valid:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Uploaded content does not appear to be a valid insurance policy document.",
+                )
 
-    file_url = None
-    if file and file_bytes and file.filename:
-        try:
-            file_url = _upload_to_storage(file_bytes, user_id, file.filename)
-        except Exception as storage_error:
-            logging.exception("Storage Error: %s", storage_error)
+        file_url = None
+        if upload_path and file.filename:
+            file_url = _storage_path(user_id, file.filename, file_hash)
+
+        data = {
+            "user_id": user_id,
+            "policy_name": policy_name,
+            "policy_number": policy_number,
+            "extracted_text": extracted_text,
+            "uploaded_file_url": file_url,
+            "is_test_data": _is_test_data(extracted_text),
+            "file_hash": file_hash,
+        }
+
+        storage_op = (
+            asyncio.to_thread(_upload_to_storage, upload_path, file_url)
+            if file_url
+            else asyncio.sleep(0)
+        )
+        # Only the upload and the row insert overlap; indexing starts once
+        # both have succeeded so a rollback never races an indexing task
+        storage_result, saved = await asyncio.gather(
+            storage_op,
+            _save_policy(data, user_id),
+            return_exceptions=True,
+        )
+
+        if isinstance(saved, BaseException):
+            if file_url and not isinstance(storage_result, BaseException):
+                await asyncio.to_thread(_remove_from_storage, file_url)
+            if isinstance(saved, HTTPException):
+                raise saved
+            _handle_db_error(saved)
+            return
+        if isinstance(storage_result, BaseException):
+            logging.error("Storage Error: %s", storage_result)
+            await asyncio.to_thread(_delete_policy_row, saved)
             raise HTTPException(status_code=500, detail="File storage failed.")
 
-    data = {
-        "user_id": user_id,
-        "policy_name": policy_name,
-        "policy_number": policy_number,
-        "extracted_text": extracted_text,
-        "uploaded_file_url": file_url,
-    }
+        result = await _start_indexing(extracted_text, saved, sync_indexing)
 
-    try:
-        result = await _save_policy_and_index(
-            data, user_id, sync_indexing, background_tasks
+        log_activity(
+            user_id=user_id,
+            activity_type="upload",
+            title=f"Uploaded {policy_name or 'Policy'}",
+            description=f"{policy_name or 'Policy document'} successfully uploaded and processed",
+            details={
+                "policy_id": result.policy_id,
+                "file_type": "file" if file else "text",
+                "file_name": file.filename if file else None,
+                "text_length": len(extracted_text or ""),
+            },
         )
-    except HTTPException:
-        raise
-    except Exception as db_error:
-        _handle_db_error(db_error)
-        return
-
-    log_activity(
-        user_id=user_id,
-        activity_type="upload",
-        title=f"Uploaded {policy_name or 'Policy'}",
-        description=f"{policy_name or 'Policy document'} successfully uploaded and processed",
-        details={
-            "policy_id": result.policy_id,
-            "file_type": "file" if file else "text",
-            "file_name": file.filename if file else None,
-            "text_length": len(extracted_text or ""),
-        },
-    )
 
-    _invalidate_caches(user_id)
-    return result
+        _invalidate_caches(user_id)
+        return result
+    finally:
+        _remove_temp_file(upload_path)
 
 
 @router.get("/policies")
@@ -311,24 +425,18 @@ def get_user_policies(
         if cached:
             return cached
 
-        count_res = (
-            supabase.table("policies")
-            .select("id", count=CountMethod.exact)
-            .eq("user_id", user_id)
-            .execute()
-        )
-        total = getattr(count_res, "count", 0) or 0
-
         policies = (
             supabase.table("policies")
             .select(
-                "id, policy_name, policy_number, created_at, validation_score, validation_metadata, uploaded_file_url"
+                "id, policy_name, policy_number, created_at, validation_score, validation_metadata, uploaded_file_url",
+                count=CountMethod.exact,
             )
             .eq("user_id", user_id)
             .order("created_at", desc=True)
             .range(offset, offset + page_size - 1)
             .execute()
         )
+        total = getattr(policies, "count", 0) or 0
         data = policies.data if policies.data else []
         result = {
             "policies": data,
@@ -405,6 +513,7 @@ def delete_policy(
                 status_code=404, detail="Policy not found or access denied."
             )
         policy_repo.delete(policy_id, auth_client)
+        _invalidate_policy_cache(policy_id)
         log_activity(
             user_id=user_id,
             activity_type="delete",
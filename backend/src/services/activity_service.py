@@ -1,9 +1,113 @@
+import os
 import uuid
+import time
+import queue
 import logging
+import threading
 from datetime import datetime
-from typing import Union, Dict
+from typing import Iterable, List, Optional, Union, Dict
+from src.caching import cache_manager
 from src.db import supabase
 
+ACTIVITY_BATCH_SIZE = int(os.getenv("ACTIVITY_BATCH_SIZE", "50"))
+ACTIVITY_FLUSH_INTERVAL_SECONDS = float(
+    os.getenv("ACTIVITY_FLUSH_INTERVAL_SECONDS", "0.5")
+)
+
+# Thread-safe so both async handlers and sync routes (threadpool) can enqueue.
+# ``None`` is the shutdown sentinel.
+_activity_queue: "queue.Queue[Optional[Dict]]" = queue.Queue()
+_flusher: Optional[threading.Thread] = None
+
+
+def _invalidate_activity_caches(user_ids: Iterable[str]) -> None:
+    """Drop cached activity feeds and history pages for ``user_ids``.
+
+    Routes clear these right after ``log_activity`` returns, but a queued row
+    lands later, so a read in between re-caches the stale list.
+    """
+    activities_cache = cache_manager.get_cache("activities")
+    history_cache = cache_manager.get_cache("history")
+    for user_id in user_ids:
+        if activities_cache is not None:
+            activities_cache.delete(f"activities:{user_id}")
+        if history_cache is not None:
+            prefix = f"history:{user_id}:"
+            for key in history_cache.keys():
+                if key.startswith(prefix):
+                    history_cache.delete(key)
+
+
+def _insert_activities(rows: List[Dict]) -> None:
+    try:
+        supabase.table("activities").insert(rows).execute()
+        logging.debug("Logged %d activities", len(rows))
+        inserted = rows
+    except Exception as e:
+        if len(rows) == 1:
+            logging.exception("Error logging activity: %s", e)
+            return
+        # One bad row fails the whole insert; retry singly so only it is lost.
+        logging.warning(
+            "Batch insert of %d activities failed (%s); retrying singly",
+            len(rows),
+            e,
+        )
+        inserted = []
+        for row in rows:
+            try:
+                supabase.table("activities").insert(row).execute()
+                inserted.append(row)
+            except Exception as row_error:
+                logging.exception(
+                    "Error logging activity %s: %s", row.get("id"), row_error
+                )
+    _invalidate_activity_caches({row["user_id"] for row in inserted})
+
+
+def _flush_loop() -> None:
+    """Drain the queue in batches of up to ACTIVITY_BATCH_SIZE rows or one interval."""
+    stopping = False
+    while not stopping:
+        item = _activity_queue.get()
+        if item is None:
+            break
+        rows = [item]
+        deadline = time.monotonic() + ACTIVITY_FLUSH_INTERVAL_SECONDS
+        while len(rows) < ACTIVITY_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = _activity_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                stopping = True
+                break
+            rows.append(item)
+        _insert_activities(rows)
+
+
+def start_activity_flusher() -> None:
+    global _flusher
+    if _flusher and _flusher.is_alive():
+        return
+    _flusher = threading.Thread(
+        target=_flush_loop, name="activity-flusher", daemon=True
+    )
+    _flusher.start()
+
+
+def stop_activity_flusher(timeout: float = 5.0) -> None:
+    """Flush everything queued so far, then stop the background writer."""
+    global _flusher
+    if not (_flusher and _flusher.is_alive()):
+        return
+    _activity_queue.put(None)
+    _flusher.join(timeout)
+    _flusher = None
+
 
 def log_activity(
     user_id: str,
@@ -12,17 +116,22 @@ def log_activity(
     description: str,
     details: Union[Dict, None] = None,
 ):
+    activity_data = {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "type": activity_type,
+        "title": title,
+        "description": description,
+        "details": details or {},
+        "status": "completed",
+        "created_at": datetime.utcnow().isoformat(),
+    }
+    if _flusher and _flusher.is_alive():
+        # Nothing is persisted yet; the flusher invalidates caches once it is.
+        _activity_queue.put_nowait(activity_data)
+        return None
+    # No flusher running (scripts, tests): write through synchronously.
     try:
-        activity_data = {
-            "id": str(uuid.uuid4()),
-            "user_id": user_id,
-            "type": activity_type,
-            "title": title,
-            "description": description,
-            "details": details or {},
-            "status": "completed",
-            "created_at": datetime.utcnow().isoformat(),
-        }
         result = supabase.table("activities").insert(activity_data).execute()
         logging.debug("Activity logged: %s - %s", activity_type, title)
         return result.data[0] if result.data else None
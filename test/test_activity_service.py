@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BACKEND_ROOT = REPO_ROOT / "backend"
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.caching import cache_manager
+from src.services import activity_service
+
+
+def _row(user_id, row_id):
+    return {"id": row_id, "user_id": user_id, "type": "chat"}
+
+
+class TestInsertActivities:
+    def test_failed_batch_is_retried_row_by_row(self):
+        inserted = []
+
+        def insert(payload):
+            query = MagicMock()
+            if isinstance(payload, list) or payload["id"] == "bad":
+                query.execute.side_effect = Exception("invalid input syntax")
+            else:
+                query.execute.side_effect = lambda: inserted.append(payload["id"])
+            return query
+
+        client = MagicMock()
+        client.table.return_value.insert.side_effect = insert
+        rows = [_row("u1", "a"), _row("u2", "bad"), _row("u3", "c")]
+        with patch.object(activity_service, "supabase", client):
+            activity_service._insert_activities(rows)
+
+        assert inserted == ["a", "c"]
+
+    def test_insert_invalidates_user_caches(self):
+        activities = cache_manager.create_cache("activities", default_ttl=30)
+        history = cache_manager.create_cache("history", default_ttl=30)
+        activities.set("activities:u1", {"activities": []})
+        activities.set("activities:u2", {"activities": []})
+        history.set("history:u1:1:20", {"activities": []})
+        history.set("history:u1:2:20", {"activities": []})
+        history.set("history:u2:1:20", {"activities": []})
+
+        with patch.object(activity_service, "supabase", MagicMock()):
+            activity_service._insert_activities([_row("u1", "a")])
+
+        assert not activities.exists("activities:u1")
+        assert activities.exists("activities:u2")
+        assert history.keys() == ["history:u2:1:20"]
+        activities.clear()
+        history.clear()
+
+
+class TestLogActivity:
+    def test_queued_activity_is_not_reported_as_persisted(self):
+        alive = MagicMock()
+        alive.is_alive.return_value = True
+        with patch.object(activity_service, "_flusher", alive):
+            result = activity_service.log_activity("u1", "chat", "title", "desc")
+        assert result is None
+        queued = activity_service._activity_queue.get_nowait()
+        assert queued["user_id"] == "u1"
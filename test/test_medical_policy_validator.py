@@ -0,0 +1,347 @@
+import re
+import sys
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BACKEND_ROOT = REPO_ROOT / "backend"
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src import medical_policy_validator as mpv
+from src.caching import cache_manager
+from src.medical_policy_validator import (
+    DocumentCategory,
+    MedicalPolicyValidator,
+    ValidationResult,
+)
+
+# Enough keywords to pass stage 1 but not the keyword fast path, so stage 2
+# asks the LLM
+LLM_PATH_POLICY = """
+Policy Number: SH/12345/2024
+Policy Holder: John Doe
+Annual Premium: 12,500
+Coverage: cashless treatment at network hospitals, claim within 30 days
+"""
+
+
+class FakeStream:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        for token in self.tokens:
+            self.consumed += 1
+            delta = SimpleNamespace(content=token)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    def close(self):
+        self.closed = True
+
+
+class FakeGroq:
+    """Returns the queued streams (or raises the queued errors) in order."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.calls += 1
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def _clear_report_cache():
+    reports = cache_manager.get_cache("validation_reports")
+    if reports is not None:
+        reports.clear()
+
+
+@pytest.fixture
+def fake_groq():
+    """Install a FakeGroq client over an empty semantic and report cache."""
+
+    def install(*responses):
+        client = FakeGroq(*responses)
+        stack.enter_context(patch.object(mpv, "groq_client", client))
+        return client
+
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch.object(mpv, "_classification_cache", mpv._SemanticClassificationCache())
+        )
+        _clear_report_cache()
+        yield install
+        _clear_report_cache()
+
+
+class TestValidationCache:
+    def test_fallback_verdict_is_not_cached(self, fake_groq):
+        client = fake_groq(
+            RuntimeError("groq unavailable"), FakeStream(["Invoice"])
+        )
+        validator = MedicalPolicyValidator()
+
+        first = validator.validate_document(LLM_PATH_POLICY)
+        second = validator.validate_document(LLM_PATH_POLICY)
+
+        assert client.calls == 2
+        assert first.category == DocumentCategory.MEDICAL_POLICY
+        assert second.category == DocumentCategory.INVOICE
+
+    def test_llm_verdict_is_cached(self, fake_groq):
+        client = fake_groq(FakeStream(["Invoice"]))
+        validator = MedicalPolicyValidator()
+
+        first = validator.validate_document(LLM_PATH_POLICY)
+        second = validator.validate_document(LLM_PATH_POLICY)
+
+        assert client.calls == 1
+        assert first == second
+
+
+POLICY_TEMPLATE = """
+STAR HEALTH INSURANCE COMPANY LIMITED - FAMILY HEALTH OPTIMA
+Policy Number: {number}   Policy Holder: {holder}
+Sum Insured: {amount}   Annual Premium: {premium}
+Period of insurance from {start} to {end}
+Coverage: in-patient hospitalisation, pre and post hospitalisation expenses,
+day care procedures, ambulance charges and cashless treatment at network
+hospitals. Claims must be intimated to the TPA within 24 hours of admission.
+Co-payment of 20 percent applies to insured persons above 60 years of age.
+"""
+
+INVOICE_TEXT = """
+TAX INVOICE  Invoice Number: INV-2291  Date: 12/03/2024
+Bill to: Acme Traders, MG Road. Item: office chairs x 4, delivery charges.
+Amount due within 15 days. Payment by bank transfer. Total amount 18,400.
+"""
+
+
+def _classify(text):
+    return MedicalPolicyValidator()._classify_document(text, text.lower())
+
+
+class TestSemanticClassificationCache:
+    def test_near_duplicate_reuses_llm_answer(self, fake_groq):
+        client = fake_groq(FakeStream(["Medical Policy"]))
+        first = POLICY_TEMPLATE.format(
+            number="SH/12345/2024", holder="John Doe", amount="5,00,000",
+            premium="12,500", start="01/04/2024", end="31/03/2025",
+        )
+        second = POLICY_TEMPLATE.format(
+            number="SH/99871/2023", holder="Priya Sharma", amount="10,00,000",
+            premium="21,300", start="15/08/2023", end="14/08/2024",
+        )
+
+        assert _classify(first)["category"] == DocumentCategory.MEDICAL_POLICY
+        result = _classify(second)
+
+        assert client.calls == 1
+        assert result["category"] == DocumentCategory.MEDICAL_POLICY
+        assert result["raw_response"].startswith("Cached classification")
+
+    def test_dissimilar_text_asks_llm(self, fake_groq):
+        client = fake_groq(FakeStream(["Medical Policy"]), FakeStream(["Invoice"]))
+        policy = POLICY_TEMPLATE.format(
+            number="SH/12345/2024", holder="John Doe", amount="5,00,000",
+            premium="12,500", start="01/04/2024", end="31/03/2025",
+        )
+
+        _classify(policy)
+        result = _classify(INVOICE_TEXT)
+
+        assert client.calls == 2
+        assert result["category"] == DocumentCategory.INVOICE
+
+    def test_fallback_result_is_not_inserted(self, fake_groq):
+        client = fake_groq(RuntimeError("rate limited"), FakeStream(["Invoice"]))
+
+        assert _classify(INVOICE_TEXT)["fallback"] is True
+        assert mpv._classification_cache._size == 0
+        result = _classify(INVOICE_TEXT)
+
+        assert client.calls == 2
+        assert result["raw_response"] == "Invoice"
+
+    @pytest.mark.parametrize("answer", [[], ["Insurance", " document"]])
+    def test_unrecognised_answer_is_not_inserted(self, fake_groq, answer):
+        client = fake_groq(FakeStream(answer), FakeStream(["Invoice"]))
+
+        assert _classify(INVOICE_TEXT)["category"] == DocumentCategory.OTHERS
+        assert mpv._classification_cache._size == 0
+        result = _classify(INVOICE_TEXT)
+
+        assert client.calls == 2
+        assert result["category"] == DocumentCategory.INVOICE
+
+    def test_expired_entry_asks_llm_again(self, fake_groq):
+        client = fake_groq(FakeStream(["Invoice"]), FakeStream(["Invoice"]))
+        _classify(INVOICE_TEXT)
+        _classify(INVOICE_TEXT)
+        assert client.calls == 1
+
+        expires_after = time.monotonic() + mpv._classification_cache.ttl_seconds
+        with patch.object(mpv.time, "monotonic", return_value=expires_after + 1):
+            _classify(INVOICE_TEXT)
+
+        assert client.calls == 2
+
+
+class FailingStream(FakeStream):
+    def __iter__(self):
+        yield from super().__iter__()
+        raise ConnectionError("stream reset")
+
+
+class TestStreamingClassification:
+    def test_stops_reading_after_complete_category(self, fake_groq):
+        stream = FakeStream(["Travel", " Ticket", "\n", "Invoice"])
+        fake_groq(stream)
+
+        result = _classify(INVOICE_TEXT)
+
+        assert result["category"] == DocumentCategory.TRAVEL_TICKET
+        assert stream.consumed == 2
+        assert stream.closed
+
+    def test_prefix_of_longer_category_keeps_reading(self, fake_groq):
+        stream = FakeStream(["Invoice", " Summary"])
+        fake_groq(stream)
+        names = {
+            **MedicalPolicyValidator.CATEGORY_NAMES,
+            "Invoice Summary": DocumentCategory.HEALTH_RECORD,
+        }
+        with (
+            patch.object(MedicalPolicyValidator, "CATEGORY_NAMES", names),
+            patch.object(
+                MedicalPolicyValidator,
+                "FINAL_CATEGORY_NAMES",
+                mpv._final_category_names(names),
+            ),
+        ):
+            result = _classify(INVOICE_TEXT)
+
+        assert result["category"] == DocumentCategory.HEALTH_RECORD
+        assert stream.consumed == 2
+        assert stream.closed
+
+    def test_stream_is_closed_when_it_fails(self, fake_groq):
+        stream = FailingStream(["Inv"])
+        fake_groq(stream)
+
+        result = _classify(INVOICE_TEXT)
+
+        assert result["fallback"] is True
+        assert stream.closed
+
+
+FAST_PATH_POLICY = POLICY_TEMPLATE.format(
+    number="SH/12345/2024", holder="John Doe", amount="5,00,000",
+    premium="12,500", start="01/04/2024", end="31/03/2025",
+) + (
+    "Health insurance validity: effective date 01/04/2024, "
+    "expiry date 31/03/2025, deductible nil."
+)
+
+
+class TestBulkValidation:
+    def test_results_keep_input_order_and_isolate_failures(self, fake_groq):
+        client = fake_groq()
+        texts = [
+            FAST_PATH_POLICY,
+            "BROKEN DOCUMENT",
+            "just a grocery list",
+            FAST_PATH_POLICY + " copy",
+        ]
+        # Earlier documents finish last, so completion order is reversed
+        delays = {text: 0.03 * (len(texts) - i) for i, text in enumerate(texts)}
+        run_pipeline = MedicalPolicyValidator._run_pipeline
+
+        def slow_pipeline(self, text):
+            time.sleep(delays[text])
+            if text == "BROKEN DOCUMENT":
+                raise ValueError("corrupt text layer")
+            return run_pipeline(self, text)
+
+        with patch.object(MedicalPolicyValidator, "_run_pipeline", slow_pipeline):
+            reports = MedicalPolicyValidator().validate_documents_bulk(texts)
+
+        assert [r.result for r in reports] == [
+            ValidationResult.VALID_POLICY,
+            ValidationResult.INVALID_NOT_POLICY,
+            ValidationResult.INVALID_INSUFFICIENT_KEYWORDS,
+            ValidationResult.VALID_POLICY,
+        ]
+        assert reports[1].suggestions == mpv.PROCESSING_ERROR_SUGGESTIONS
+        assert client.calls == 0
+
+
+try:
+    import re2
+except ImportError:  # optional accelerator
+    re2 = None
+
+FIELD_ENGINES = [
+    pytest.param(re, id="re"),
+    pytest.param(
+        re2,
+        id="re2",
+        marks=pytest.mark.skipif(re2 is None, reason="google-re2 not installed"),
+    ),
+]
+
+SCHEDULE_TEXT = """
+POLICY SCHEDULE
+POLICY NO: SH/12345/2024
+Insurance Company: Star Health and Allied
+policy holder: John Doe
+Sum Insured: ₹ 5,00,000
+Annual Premium: ₹12,500
+Valid till 31/03/2025
+"""
+
+
+class TestFieldExtraction:
+    @pytest.mark.parametrize("engine", FIELD_ENGINES)
+    def test_engines_extract_the_same_fields(self, engine):
+        compiled = mpv._compile_field_patterns(
+            MedicalPolicyValidator.MANDATORY_FIELDS, engine
+        )
+        with patch.object(MedicalPolicyValidator, "_COMPILED_FIELDS", compiled):
+            result = MedicalPolicyValidator()._extract_fields(SCHEDULE_TEXT)
+
+        assert result["extracted_fields"] == {
+            "policy_number": "SH/12345/2024",
+            "provider_name": "Star Health and Allied",
+            "sum_insured": "5,00,000",
+            "premium_amount": "12,500",
+            "policy_holder": "John Doe",
+            "expiry_date": "31/03/2025",
+        }
+        assert result["missing_fields"] == []
+
+    @pytest.mark.parametrize("engine", FIELD_ENGINES)
+    def test_engines_report_the_same_missing_fields(self, engine):
+        compiled = mpv._compile_field_patterns(
+            MedicalPolicyValidator.MANDATORY_FIELDS, engine
+        )
+        with patch.object(MedicalPolicyValidator, "_COMPILED_FIELDS", compiled):
+            result = MedicalPolicyValidator()._extract_fields(INVOICE_TEXT)
+
+        assert result["extracted_fields"] == {}
+        assert result["missing_fields"] == list(
+            MedicalPolicyValidator._FIELD_LABELS.values()
+        )
@@ -0,0 +1,137 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BACKEND_ROOT = REPO_ROOT / "backend"
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.monitoring import (
+    ENDPOINT_LOCK_STRIPES,
+    MAX_ENDPOINTS,
+    OVERFLOW_ENDPOINT_KEY,
+    PerformanceMonitor,
+    RingBuffer,
+)
+
+
+def _record(monitor, endpoint, status_code, seconds, method="GET"):
+    request_id = monitor.start_request(endpoint, method)
+    monitor.end_request(
+        request_id, endpoint, method, status_code,
+        start_ns=time.perf_counter_ns() - int(seconds * 1e9),
+    )
+
+
+class TestPerformanceSummary:
+    def test_empty_summary(self):
+        summary = PerformanceMonitor().get_performance_summary()
+        assert summary["total_requests"] == 0
+        assert summary["top_endpoints"] == []
+
+    def test_summary_aggregates(self):
+        monitor = PerformanceMonitor()
+        for _ in range(90):
+            _record(monitor, "/policies", 200, 0.1)
+        for _ in range(10):
+            _record(monitor, "/chat", 500, 0.5)
+
+        summary = monitor.get_performance_summary()
+        assert summary["total_requests"] == 100
+        assert summary["error_count"] == 10
+        assert summary["error_rate"] == 10.0
+        assert summary["avg_response_time"] == 0.14
+        assert summary["top_endpoints"][0] == {"endpoint": "GET /policies", "requests": 90}
+        # Percentiles are histogram bucket upper bounds
+        assert 0.1 <= summary["p50_response_time"] < 0.12
+        assert 0.5 <= summary["p99_response_time"] < 0.6
+        assert summary["active_requests"] == 0
+
+    def test_summary_is_reused_within_ttl(self):
+        monitor = PerformanceMonitor()
+        _record(monitor, "/policies", 200, 0.1)
+        first = monitor.get_performance_summary()
+        _record(monitor, "/policies", 200, 0.1)
+        assert monitor.get_performance_summary() is first
+        assert first["total_requests"] == 1
+
+    def test_reset_clears_window(self):
+        monitor = PerformanceMonitor()
+        _record(monitor, "/policies", 200, 0.1)
+        monitor.reset_stats()
+        assert monitor.get_performance_summary()["total_requests"] == 0
+        assert monitor.get_endpoint_stats() == {}
+
+
+class TestEndpointStats:
+    def test_busiest_endpoint_first(self):
+        monitor = PerformanceMonitor()
+        _record(monitor, "/chat", 200, 0.2)
+        for _ in range(3):
+            _record(monitor, "/policies", 404, 0.1)
+
+        stats = monitor.get_endpoint_stats()
+        assert list(stats) == ["GET /policies", "GET /chat"]
+        assert stats["GET /policies"]["error_rate"] == 100.0
+
+        detail = monitor.get_endpoint_stats("GET /chat")
+        assert detail["total_requests"] == 1
+        assert detail["min_response_time"] == detail["max_response_time"] == 0.2
+        assert 0.2 <= detail["p95_response_time"] < 0.24
+        assert monitor.get_endpoint_stats("GET /missing") == {}
+
+    def test_overflow_endpoints_are_folded(self):
+        monitor = PerformanceMonitor()
+        for i in range(MAX_ENDPOINTS + 10):
+            _record(monitor, f"/unknown/{i}", 404, 0.01)
+
+        stats = monitor.get_endpoint_stats()
+        assert len(stats) == MAX_ENDPOINTS
+        assert stats[OVERFLOW_ENDPOINT_KEY]["total_requests"] == 11
+
+
+    def test_flush_takes_only_touched_stripes(self):
+        monitor = PerformanceMonitor()
+        endpoint_id = monitor._endpoint_id("GET", "/policies")
+        other_stripe = monitor._stripes[(endpoint_id + 1) % ENDPOINT_LOCK_STRIPES]
+        held, release = threading.Event(), threading.Event()
+
+        def hold_other_stripe():
+            with other_stripe:
+                held.set()
+                release.wait(5)
+
+        holder = threading.Thread(target=hold_other_stripe)
+        holder.start()
+        held.wait(5)
+        try:
+            _record(monitor, "/policies", 200, 0.1)
+            flusher = threading.Thread(target=monitor.flush)
+            flusher.start()
+            flusher.join(1)
+            assert not flusher.is_alive()
+        finally:
+            release.set()
+            holder.join()
+        assert monitor.get_endpoint_stats("GET /policies")["total_requests"] == 1
+
+
+class TestRingBuffer:
+    def test_capacity_rounds_up_and_reports_evictions(self):
+        ring = RingBuffer(3, "i8")
+        assert ring.capacity == 4
+        assert [ring.append(i) for i in range(4)] == [None] * 4
+        assert ring.append(4) == 0
+        assert ring.append(5) == 1
+        assert len(ring) == 4
+
+    def test_system_error_rate_tracks_retained_rows(self):
+        monitor = PerformanceMonitor(max_metrics_history=4)
+        for status_code in (500, 500, 200, 200, 200, 200, 404):
+            _record(monitor, "/policies", status_code, 0.01)
+        monitor.record_system_metric()
+        sample = monitor.system_metrics[-1]
+        assert sample.total_requests == 4
+        assert sample.error_rate == 25.0
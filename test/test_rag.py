@@ -45,7 +45,7 @@ class TestIndexDocuments:
     async def test_index_documents_with_embeddings(self):
         with (
             patch("src.rag.supabase_storage") as mock_supabase,
-            patch("src.rag.embed_texts") as mock_embed,
+            patch("src.rag.embed_texts_with_cache_async") as mock_embed,
             patch("src.rag.should_embed_chunk", return_value=True) as _,
             patch("src.rag.EXPECTED_EMBED_DIM", 3),
         ):
@@ -63,7 +63,7 @@ class TestIndexDocuments:
     async def test_index_documents_without_embeddings(self):
         with (
             patch("src.rag.supabase_storage") as mock_supabase,
-            patch("src.rag.embed_texts") as mock_embed,
+            patch("src.rag.embed_texts_with_cache_async") as mock_embed,
             patch("src.rag.should_embed_chunk", return_value=True) as _,
         ):
             mock_embed.side_effect = Exception("API key missing")
@@ -78,7 +78,7 @@ class TestIndexDocuments:
     async def test_index_documents_dimension_mismatch(self):
         with (
             patch("src.rag.supabase_storage") as mock_supabase,
-            patch("src.rag.embed_texts") as mock_embed,
+            patch("src.rag.embed_texts_with_cache_async") as mock_embed,
             patch("src.rag.should_embed_chunk", return_value=True) as _,
             patch("src.rag.EXPECTED_EMBED_DIM", 768),
         ):
@@ -91,6 +91,31 @@ class TestIndexDocuments:
             with pytest.raises(RuntimeError, match="dimension mismatch"):
                 await index_documents(text, "doc123")
 
+    async def test_index_documents_rolls_back_on_later_slice_failure(self):
+        with (
+            patch("src.rag.supabase_storage") as mock_supabase,
+            patch("src.rag.embed_texts_with_cache_async") as mock_embed,
+            patch("src.rag.should_embed_chunk", return_value=True) as _,
+            patch("src.rag.EXPECTED_EMBED_DIM", 3),
+            patch("src.rag.CHUNK_INSERT_BATCH_SIZE", 2),
+        ):
+            mock_embed.return_value = [[0.1, 0.2, 0.3]] * 4
+            mock_result = Mock()
+            mock_result.error = None
+            mock_supabase.table().insert().execute.side_effect = [
+                mock_result,
+                Exception("payload too large"),
+            ]
+
+            text = "one two three four five six seven"
+            with pytest.raises(RuntimeError, match="payload too large"):
+                await index_documents(text, "doc123", chunk_size=3, overlap=1)
+
+            assert mock_supabase.table().insert().execute.call_count == 2
+            mock_supabase.table().delete().eq.assert_called_once_with(
+                "policy_id", "doc123"
+            )
+
 
 class TestRetrieveTopK:
     async def test_retrieve_top_k_success(self):
@@ -136,5 +161,34 @@ class TestRetrieveTopK:
             assert results == []
 
 
+class TestEmbedTextsWithCacheAsync:
+    async def test_batches_by_length_and_restores_order(self):
+        embeddings = importlib.import_module("src.embeddings")
+        batches = []
+
+        async def fake_embed(texts, provider=None, use_cache=True):
+            batches.append(list(texts))
+            return [[float(len(text))] for text in texts]
+
+        texts = ["aa", "a", "aaaa", "aaa", "aaaaa"]
+        with patch.object(embeddings.embedding_manager, "embed_texts", fake_embed):
+            result = await embeddings.embed_texts_with_cache_async(
+                texts, batch_size=2, concurrency=2
+            )
+
+        assert result == [[2.0], [1.0], [4.0], [3.0], [5.0]]
+        assert batches == [["aaaaa", "aaaa"], ["aaa", "aa"], ["a"]]
+
+    async def test_short_batch_raises(self):
+        embeddings = importlib.import_module("src.embeddings")
+
+        async def fake_embed(texts, provider=None, use_cache=True):
+            return [[1.0]] * (len(texts) - 1)
+
+        with patch.object(embeddings.embedding_manager, "embed_texts", fake_embed):
+            with pytest.raises(embeddings.ProcessingError, match="count mismatch"):
+                await embeddings.embed_texts_with_cache_async(["a", "bb", "ccc"])
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])